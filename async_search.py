@@ -0,0 +1,139 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from search_backends import (DDG_HTML_URL, SearchBlocked, extract_linkedin_candidates, fetch_results_page,
+                             is_block_page, setup_http_session)
+from rate_limit import HostRateLimiter, DEFAULT_HOST_RATE, DEFAULT_HOST_BURST
+from query_planner import QueryPlanner
+from metrics import span
+
+async def search_linkedin_candidates_async(session, name, university, limiter, executor, cache=None,
+                                           planner=None, course='', pacer=None, query_search=None):
+    """Search over HTTP once the host's rate limiter allows it ([] if none, None on error).
+
+    Query variants are tried in the planner's order until one is conclusive, each
+    paying its own token. Cached queries are answered without spending any of the
+    host's request budget. With a `pacer`, every outcome adjusts the limiter's
+    rate and block pages pause all searches for the pacer's cooldown. A blocking
+    `query_search(session, query)` (engine_scheduler.engine_search) replaces the
+    DuckDuckGo fetch; it keeps each engine's budget itself, in an executor thread.
+    """
+    if cache is not None:
+        candidates = cache.get(name, university)
+        if candidates is not None:
+            return candidates
+
+    if planner is None:
+        planner = QueryPlanner(path=None)
+    loop = asyncio.get_running_loop()
+    collected = {}
+    errors = 0
+
+    for tier, query in planner.queries(name, course, university):
+        try:
+            with span('pacing'):
+                if pacer is not None and pacer.cooldown_left():
+                    await asyncio.sleep(pacer.cooldown_left())
+                if query_search is None:
+                    await limiter.acquire(DDG_HTML_URL)
+            with span('query', tier=tier):
+                if query_search is not None:
+                    # Run in a copy of this context, so the engine's pacing is left out of the 'query' span
+                    candidates = await loop.run_in_executor(
+                        executor, contextvars.copy_context().run, query_search, session, query)
+                    if candidates is None:
+                        raise RuntimeError("nenhum buscador respondeu")
+                else:
+                    with span('fetch'):
+                        page_source = await loop.run_in_executor(executor, fetch_results_page, session, query)
+                    with span('parse'):
+                        candidates = await loop.run_in_executor(executor, extract_linkedin_candidates, page_source)
+                    if not candidates and is_block_page(page_source):
+                        raise SearchBlocked("página de desafio")
+
+        except SearchBlocked as e:
+            print(f"      🚫 Bloqueio detectado: {e}")
+            errors += 1
+            if pacer is not None:
+                pacer.observe('blocked')
+                limiter.set_rate(pacer.rate)
+            break
+        except Exception as e:
+            print(f"      Search error: {e}")
+            errors += 1
+            if pacer is not None:
+                pacer.observe('error')
+                limiter.set_rate(pacer.rate)
+            continue
+
+        if pacer is not None:
+            pacer.observe('ok' if candidates else 'empty')
+            limiter.set_rate(pacer.rate)
+
+        if planner.observe(tier, candidates, collected, name, course, university):
+            break
+
+    if not collected and errors:
+        return None
+    candidates = list(collected.values())
+    if cache is not None:
+        cache.put(name, university, candidates)
+    return candidates
+
+async def run_searches(rows, on_result, concurrency=8, rate=DEFAULT_HOST_RATE, burst=DEFAULT_HOST_BURST, cache=None,
+                       planner=None, pacer=None, query_search=None):
+    """Keep up to `concurrency` searches in flight, paced only by the per-host token bucket.
+
+    `rows` is any iterable of dicts with 'Nome', 'Faculdade' and 'Curso'; `on_result(row, candidates)`
+    is called from the event loop, so it is the single writer for results. Rows are
+    pulled in a thread of their own: reading the roster, or the cohort harvest that
+    filters it, may block without stalling the searches in flight.
+    """
+    session = setup_http_session(pool_size=concurrency)
+    limiter = HostRateLimiter(rate, burst)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    reader = ThreadPoolExecutor(max_workers=1)
+    rows = iter(rows)
+    loop = asyncio.get_running_loop()
+    row_queue = asyncio.Queue(maxsize=concurrency * 2)
+    if planner is None:
+        planner = QueryPlanner(path=None)
+    if pacer is not None:
+        limiter.set_rate(pacer.rate)
+
+    async def worker():
+        while True:
+            row = await row_queue.get()
+            try:
+                if row is None:
+                    return
+                name = row.get('Nome', '').strip()
+                candidates = await search_linkedin_candidates_async(
+                    session, name, row.get('Faculdade', ''), limiter, executor, cache,
+                    planner, row.get('Curso', ''), pacer, query_search
+                )
+                on_result(row, candidates)
+            finally:
+                row_queue.task_done()
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        while True:
+            row = await loop.run_in_executor(reader, next, rows, None)
+            if row is None:
+                break
+            await row_queue.put(row)
+        for _ in workers:
+            await row_queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        executor.shutdown(wait=False)
+        reader.shutdown(wait=False)
+        session.close()
+
+def search_rows(rows, on_result, concurrency=8, rate=DEFAULT_HOST_RATE, burst=DEFAULT_HOST_BURST, cache=None,
+                planner=None, pacer=None, query_search=None):
+    """Blocking entry point for run_searches()."""
+    asyncio.run(run_searches(rows, on_result, concurrency, rate, burst, cache, planner, pacer, query_search))
@@ -0,0 +1,187 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from mock_search_server import MockSearchServer
+
+try:
+    import psutil
+except ImportError:  # resident memory is left out of the report without psutil
+    psutil = None
+
+# Pipelines that can be benchmarked: the threaded worker pool per backend, and the asyncio HTTP pipeline
+BACKENDS = ('http', 'http-async', 'multi', 'multi-async', 'selenium')
+
+# Pacing of the benchmark runs: close to none, so the numbers measure the pipeline, not the politeness delays
+BENCH_DELAY = 0.01
+BENCH_COOLDOWN = 1.0
+
+def load_rows(input_file, count):
+    """The first `count` named rows of the roster, repeated if it is shorter."""
+    with open(input_file, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = [row for row in csv.DictReader(f) if (row.get('Nome') or '').strip()]
+    if not rows:
+        raise ValueError(f"nenhum formando em {input_file}")
+    return [dict(rows[i % len(rows)]) for i in range(count)]
+
+def process_memory_mb():
+    """Resident memory of this process and its children (Chrome), or None without psutil."""
+    if psutil is None:
+        return None
+    process = psutil.Process()
+    processes = [process] + process.children(recursive=True)
+    return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+
+def run_once(backend, concurrency, rows, server, delay=BENCH_DELAY, cooldown=BENCH_COOLDOWN, cohorts=False):
+    """Search `rows` through one pipeline against the mock server and return its figures.
+
+    With `cohorts`, broad cohort queries (cohort_search) settle what they can
+    first and only the leftover rows go through the per-row pipeline.
+    """
+    # Imported here: the search URLs are read from the environment set up by main()
+    import metrics
+    import linkedin_production as lp
+    from query_planner import QueryPlanner, planned_search
+    from rate_limit import AdaptivePacer
+    from cohort_search import CohortHarvester
+    from engine_scheduler import EngineScheduler, engine_search
+    from search_backends import SEARCH_ENGINES
+
+    metrics.durations.clear()
+    server.reset_counts()
+    pacer = AdaptivePacer(delay=delay, min_delay=delay, cooldown=cooldown)
+    planner = QueryPlanner(path=None)
+    results = []
+    search_query = lp.SEARCH_BACKENDS['selenium' if backend == 'selenium' else 'http'][1]
+    if backend.startswith('multi'):
+        # Every engine points at the mock, each with the benchmark's budget instead of its real one
+        scheduler = EngineScheduler(rates={name: 1 / delay for name in SEARCH_ENGINES}, block_cooldown=cooldown)
+        search_query = engine_search(scheduler)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if cohorts:
+            pool = lp.make_session_pool('selenium' if backend == 'selenium' else 'http', 1)
+            try:
+                matches = CohortHarvester(search_query, pool, pacer).harvest(rows)
+            finally:
+                pool.close()
+            for position, (linkedin_url, confidence) in matches.items():
+                results.append(lp.build_result(rows[position]['Nome'], '', '', '', linkedin_url, confidence))
+            rows = [row for position, row in enumerate(rows) if position not in matches]
+        if rows and backend.endswith('-async'):
+            lp.process_async(iter(rows), len(rows), None, results.append, concurrency, planner=planner, pacer=pacer,
+                             query_search=search_query if backend == 'multi-async' else None)
+        elif rows:
+            lp.process_parallel(iter(rows), len(rows), None, results.append, concurrency,
+                                planned_search(search_query, planner, pacer), pacer,
+                                backend='selenium' if backend == 'selenium' else 'http')
+    elapsed = time.perf_counter() - start
+    _, peak_heap = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queries = metrics.durations.get('query')
+    query_p50, query_p95 = queries.quantiles((0.5, 0.95)) if queries else (None, None)
+    found = sum(1 for result in results if result['LinkedIn URL'])
+    errors = sum(1 for result in results if result['Match Status'] == 'Error')
+    rss = process_memory_mb()
+    return {
+        'backend': backend,
+        'concurrency': concurrency if backend.endswith('-async') else min(concurrency, lp.MAX_WORKERS),
+        'rows': len(results),
+        'found': found,
+        'requests_per_found': round(server.counts['requests'] / found, 2) if found else None,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'rows_per_minute': round(len(results) / (elapsed / 60), 1) if elapsed > 0 else 0.0,
+        'query_p50': round(query_p50, 4) if queries else None,
+        'query_p95': round(query_p95, 4) if queries else None,
+        'peak_heap_mb': round(peak_heap / (1024 * 1024), 1),
+        'rss_mb': round(rss, 1) if rss is not None else None,
+        'server': dict(server.counts),
+    }
+
+def format_report(runs):
+    lines = [
+        f"{'backend':<11} {'conc':>4} {'linhas':>6} {'linhas/min':>10} {'p50':>7} {'p95':>7} {'heap MB':>8} "
+        f"{'RSS MB':>8} {'erros':>5} {'req/perfil':>10}",
+        "-" * 87,
+    ]
+    for run in runs:
+        p50 = f"{run['query_p50']:.3f}" if run['query_p50'] is not None else '-'
+        p95 = f"{run['query_p95']:.3f}" if run['query_p95'] is not None else '-'
+        rss = f"{run['rss_mb']:.1f}" if run['rss_mb'] is not None else '-'
+        per_found = f"{run['requests_per_found']:.2f}" if run['requests_per_found'] is not None else '-'
+        lines.append(
+            f"{run['backend']:<11} {run['concurrency']:>4} {run['rows']:>6} {run['rows_per_minute']:>10.1f} "
+            f"{p50:>7} {p95:>7} {run['peak_heap_mb']:>8.1f} {rss:>8} {run['errors']:>5} {per_found:>10}"
+        )
+    return '\n'.join(lines)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mede a vazão do pipeline de busca contra um mock local do DuckDuckGo."
+    )
+    parser.add_argument('--input', default='new_graduates.csv', help="CSV de formandos usado como carga")
+    parser.add_argument('--rows', type=int, default=100, help="registros buscados por execução (padrão: 100)")
+    parser.add_argument('--backends', default='http,http-async',
+                        help=f"lista separada por vírgulas entre {', '.join(BACKENDS)} (padrão: http,http-async)")
+    parser.add_argument('--concurrency', default='1,4,8', help="níveis de concorrência (padrão: 1,4,8)")
+    parser.add_argument('--latency', type=float, default=0.2, help="latência do mock, em segundos (padrão: 0.2)")
+    parser.add_argument('--jitter', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--block-rate', type=float, default=0.0)
+    parser.add_argument('--miss-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--cohorts', action='store_true', help="busca por coorte antes das buscas individuais")
+    parser.add_argument('--json', dest='json_file', help="também grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+    args.backends = [backend.strip() for backend in args.backends.split(',') if backend.strip()]
+    unknown = [backend for backend in args.backends if backend not in BACKENDS]
+    if unknown:
+        parser.error(f"backend desconhecido: {', '.join(unknown)}")
+    args.concurrency = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = load_rows(args.input, args.rows)
+    # The mock knows the roster, so broad queries list whole cohorts and name queries find their person
+    server = MockSearchServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              block_rate=args.block_rate, miss_rate=args.miss_rate, seed=args.seed,
+                              roster=rows).start()
+    os.environ['DDG_URL'] = server.url
+    os.environ['DDG_HTML_URL'] = server.html_url
+    for variable in ('BING_URL', 'MOJEEK_URL', 'BRAVE_URL'):
+        os.environ[variable] = server.search_url
+    print(f"🦆 Mock em {server.url}: latência {args.latency}s ±{args.jitter}s, "
+          f"erros {args.error_rate:.0%}, bloqueios {args.block_rate:.0%}, sem resultados {args.miss_rate:.0%}")
+
+    runs = []
+    try:
+        for backend in args.backends:
+            for concurrency in args.concurrency:
+                print(f"⏱️  {backend} x{concurrency}: {len(rows)} registros...", flush=True)
+                try:
+                    runs.append(run_once(backend, concurrency, rows, server, cohorts=args.cohorts))
+                except Exception as e:
+                    print(f"❌ {backend} x{concurrency} falhou: {e}")
+    finally:
+        server.stop()
+
+    print()
+    print(format_report(runs))
+    if args.json_file:
+        with open(args.json_file, 'w', encoding='utf-8') as f:
+            json.dump({'at': datetime.now().isoformat(timespec='seconds'), 'settings': vars(args), 'runs': runs},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Resultados gravados em {args.json_file}")
+
+if __name__ == "__main__":
+    main()
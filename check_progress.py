@@ -1,38 +1,38 @@
+import argparse
 import json
 import glob
 import os
-import pandas as pd
+import time
 from datetime import datetime
+from graduates import count_graduates_csv
+from names import NameIndex
+from progress_stats import STATS_FILE, eta_seconds, job_rate, load_stats
 
-def is_recent_graduate(graduation_date_str):
-    """Check if graduate is from current year (2025) or previous year (2024)."""
-    try:
-        from datetime import datetime
-        current_year = datetime.now().year
-        
-        # Parse the graduation date (DD/MM/YYYY format)
-        graduation_date = datetime.strptime(graduation_date_str, '%d/%m/%Y')
-        graduation_year = graduation_date.year
-        
-        # Only accept graduates from current year or previous year
-        return graduation_year >= current_year - 1  # 2024 and 2025
-        
-    except Exception:
-        return False
+# A stats file this old means no pipeline is writing to it
+STALE_AFTER = 60
 
 def check_progress():
-    """Check current progress of LinkedIn searches (recent graduates only)."""
+    """Full scan of the CSV and master JSON (recent graduates only), when there are no stats yet."""
     print("📊 Relatório de Progresso da Busca LinkedIn (Formandos 2024-2025)")
     print("=" * 60)
     
-    # Load CSV to get total count and filter recent graduates
+    # Check master success file
+    master_file = 'linkedin_success_master.json'
+    master_data = None
+    if os.path.exists(master_file):
+        try:
+            with open(master_file, 'r', encoding='utf-8') as f:
+                master_data = json.load(f)
+        except Exception as e:
+            print(f"❌ Erro ao ler arquivo mestre: {e}")
+            return
+    
+    # Graduates already found, keyed like the pipeline does (accents, case and particles ignored)
+    found = NameIndex((r.get('Nome', ''), r.get('Data da Colação', '')) for r in master_data or [])
+    
+    # Count the CSV with the csv module (recent graduates only); pandas is not needed here
     try:
-        df = pd.read_csv('new_graduates.csv', encoding='utf-8')
-        total_records = len(df)
-        
-        # Filter for recent graduates only
-        recent_graduates = df[df['Data da Colação'].apply(is_recent_graduate)]
-        recent_count = len(recent_graduates)
+        total_records, recent_count, remaining_count = count_graduates_csv('new_graduates.csv', found.contains)
         
         print(f"📋 Total de registros no CSV: {total_records}")
         print(f"🎯 Formandos recentes (2024-2025): {recent_count}")
@@ -42,51 +42,131 @@ def check_progress():
         print(f"❌ Erro ao carregar CSV: {e}")
         return
     
-    # Check master success file
-    master_file = 'linkedin_success_master.json'
-    
-    if not os.path.exists(master_file):
+    if master_data is None:
         print("📝 Nenhum arquivo mestre de sucesso encontrado ainda")
         return
     
-    try:
-        with open(master_file, 'r', encoding='utf-8') as f:
-            master_data = json.load(f)
-        
-        # Get file modification time
-        mod_time = os.path.getmtime(master_file)
-        mod_datetime = datetime.fromtimestamp(mod_time)
-        
-        print(f"\n📄 Arquivo mestre de sucesso: {master_file}")
-        print(f"🕒 Última atualização: {mod_datetime.strftime('%Y-%m-%d %H:%M:%S')}")
+    # Get file modification time
+    mod_time = os.path.getmtime(master_file)
+    mod_datetime = datetime.fromtimestamp(mod_time)
+    
+    print(f"\n📄 Arquivo mestre de sucesso: {master_file}")
+    print(f"🕒 Última atualização: {mod_datetime.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # Summary (based on recent graduates only)
+    print(f"\n📈 PROGRESSO (Formandos Recentes 2024-2025):")
+    print(f"   ✅ Perfis únicos encontrados: {len(master_data)}")
+    print(f"   📊 Progresso: {len(master_data)}/{recent_count} ({len(master_data)/max(recent_count, 1)*100:.1f}%)")
+    print(f"   📋 Formandos recentes restantes: {remaining_count} registros")
+    
+    # Show sample of found profiles
+    if master_data:
+        print(f"\n🎯 Perfis recentes encontrados:")
         
-        # Summary (based on recent graduates only)
-        print(f"\n📈 PROGRESSO (Formandos Recentes 2024-2025):")
-        print(f"   ✅ Perfis únicos encontrados: {len(master_data)}")
-        print(f"   📊 Progresso: {len(master_data)}/{recent_count} ({len(master_data)/recent_count*100:.1f}%)")
-        print(f"   📋 Formandos recentes restantes: {recent_count - len(master_data)} registros")
+        # Show last 10 added profiles
+        recent_profiles = master_data[-10:] if len(master_data) >= 10 else master_data
         
-        # Show sample of found profiles
-        if master_data:
-            print(f"\n🎯 Perfis recentes encontrados:")
-            
-            # Show last 10 added profiles
-            recent_profiles = master_data[-10:] if len(master_data) >= 10 else master_data
-            
-            for i, record in enumerate(recent_profiles, 1):
-                name = record.get('Nome', '')
-                url = record.get('LinkedIn URL', '')
-                updated = record.get('Last Updated', '')
-                print(f"   {i:2d}. {name:<30} -> {url}")
-                print(f"       Atualizado: {updated}")
-            
-            if len(master_data) > 10:
-                print(f"   ... mostrando últimos 10 de {len(master_data)} perfis totais")
+        for i, record in enumerate(recent_profiles, 1):
+            name = record.get('Nome', '')
+            url = record.get('LinkedIn URL', '')
+            updated = record.get('Last Updated', '')
+            print(f"   {i:2d}. {name:<30} -> {url}")
+            print(f"       Atualizado: {updated}")
         
-        # Clean and simple - only show master file info
+        if len(master_data) > 10:
+            print(f"   ... mostrando últimos 10 de {len(master_data)} perfis totais")
+
+def format_eta(seconds):
+    if seconds is None:
+        return "desconhecido"
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    return f"{hours}h{minutes:02d}min" if hours else f"{minutes}min"
+
+def show_stats(data):
+    """Dashboard from the pipeline's incremental stats file, without touching the CSV."""
+    now = time.time()
+    updated_at = data.get('updated_at') or 0
+    print("📊 Relatório de Progresso da Busca LinkedIn (Formandos 2024-2025)")
+    print("=" * 60)
+    job = data.get('job') or {}
+    running = job and not job.get('finished_at') and now - updated_at <= STALE_AFTER
+    stale = "" if running else " (nenhuma busca em andamento)"
+    print(f"🕒 Última atualização: {datetime.fromtimestamp(updated_at).strftime('%Y-%m-%d %H:%M:%S')}{stale}")
     
-    except Exception as e:
-        print(f"❌ Erro ao ler arquivo mestre: {e}")
+    roster = data.get('roster') or {}
+    recent = roster.get('recent', 0)
+    master_count = data.get('master_count', 0)
+    if roster:
+        print(f"📋 Total de registros no CSV: {roster.get('total_rows', 0)}")
+        print(f"🎯 Formandos recentes (2024-2025): {recent}")
+    
+    print(f"\n📈 PROGRESSO (Formandos Recentes 2024-2025):")
+    print(f"   ✅ Perfis únicos encontrados: {master_count}")
+    if recent:
+        print(f"   📊 Progresso: {master_count}/{recent} ({master_count/recent*100:.1f}%)")
+    if roster:
+        print(f"   📋 Pendentes de busca: {roster.get('pending', 0)} registros")
+    
+    status = data.get('status') or {}
+    searched = status.get('found', 0) + status.get('not_found', 0)
+    if searched:
+        print(f"   🔎 Buscados: {searched} ({status.get('found', 0)} encontrados, {status.get('not_found', 0)} não encontrados, "
+              f"{status.get('error', 0)} erros) - taxa de acerto {status.get('found', 0)/searched*100:.1f}%")
+    
+    if job:
+        rate = job_rate(data, now)
+        job_left = max(0, job.get('expected', 0) - job.get('done', 0))
+        print(f"\n⚙️  Job #{job.get('id')}: {job.get('done', 0)}/{job.get('expected', 0)} concluídos, {job.get('errors', 0)} erros")
+        print(f"   🚀 Ritmo: {rate:.1f} registros/min")
+        print(f"   ⏳ ETA do job: {format_eta(eta_seconds(job_left, rate))}")
+        if roster:
+            print(f"   ⏳ ETA de todos os pendentes: {format_eta(eta_seconds(roster.get('pending', 0), rate))}")
+    
+    courses = data.get('courses') or {}
+    if courses:
+        print(f"\n🎓 Por curso (mais buscados):")
+        ranked = sorted(courses.items(), key=lambda item: -sum(item[1].values()))[:10]
+        for course, counts in ranked:
+            done = counts.get('found', 0) + counts.get('not_found', 0)
+            hit_rate = counts.get('found', 0) / done * 100 if done else 0.0
+            print(f"   {course[:40]:<40} {counts.get('found', 0):5d}/{done:<5d} ({hit_rate:.0f}%)")
+    
+    hours = data.get('hours') or {}
+    if hours:
+        print(f"\n🕐 Por hora (últimas 6):")
+        for hour in sorted(hours)[-6:]:
+            counts = hours[hour]
+            print(f"   {hour}  ✅ {counts.get('found', 0):4d}  ❌ {counts.get('not_found', 0):4d}  ⚠️  {counts.get('error', 0):3d}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Progresso da busca de perfis do LinkedIn")
+    parser.add_argument('--watch', nargs='?', type=float, const=5, metavar='SEGUNDOS',
+                        help="atualiza o painel continuamente (padrão: a cada 5s)")
+    parser.add_argument('--stats', default=STATS_FILE, help=f"arquivo de estatísticas (padrão: {STATS_FILE})")
+    parser.add_argument('--full', action='store_true', help="varre o CSV e o JSON mestre em vez das estatísticas")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.full:
+        check_progress()
+        return
+    
+    while True:
+        data = load_stats(args.stats)
+        if args.watch:
+            print("\033[2J\033[H", end='')
+        if data is None:
+            # No pipeline run has written stats yet
+            check_progress()
+        else:
+            show_stats(data)
+        if not args.watch:
+            return
+        try:
+            time.sleep(args.watch)
+        except KeyboardInterrupt:
+            return
 
 if __name__ == "__main__":
-    check_progress()
\ No newline at end of file
+    main()
\ No newline at end of file
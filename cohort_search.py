@@ -0,0 +1,160 @@
+import time
+from collections import defaultdict
+from graduates import graduation_year
+from match_scoring import COURSE_WEIGHT, NAME_WEIGHT, UNIVERSITY_WEIGHT, rank_candidates, score_candidate
+from metrics import span
+from names import fold_text, name_tokens
+from search_backends import SearchBlocked
+
+# Smallest group of pending rows worth a shared query
+MIN_COHORT_ROWS = 3
+
+# Rows are paired with candidates on the name alone, and only a complete name match counts
+MIN_NAME_CONFIDENCE = NAME_WEIGHT
+
+# Broad queries also return people from other courses, schools and years, so a
+# pairing is only kept with the university or the whole course in the result text
+MIN_COHORT_CONFIDENCE = NAME_WEIGHT + min(UNIVERSITY_WEIGHT, COURSE_WEIGHT)
+
+# Broad queries per course cohort, tried in order while enough of its rows are unmatched
+COHORT_QUERIES = (
+    lambda course, university, year: f"site:linkedin.com/in {course} {university}",
+    lambda course, university, year: f"site:linkedin.com/in {course} {university} {year or ''}",
+)
+
+# Broad query for a cluster of rows sharing their last surname
+SURNAME_QUERY = lambda surname, university: f"site:linkedin.com/in {surname} {university}"
+
+def cohort_groups(rows, min_rows=MIN_COHORT_ROWS):
+    """(label, queries, row positions) for groups of rows that can share broad queries.
+
+    Course cohorts (course, university and graduation year) come first, then
+    clusters of rows with the same last surname at the same university.
+    """
+    courses = defaultdict(list)
+    surnames = defaultdict(list)
+    for position, row in enumerate(rows):
+        course, university = str(row.get('Curso') or ''), str(row.get('Faculdade') or '')
+        year = graduation_year(str(row.get('Data da Colação') or ''))
+        if course.strip():
+            courses[(fold_text(course), fold_text(university), year)].append(position)
+        tokens = name_tokens(str(row.get('Nome') or ''))
+        if len(tokens) > 1:
+            surnames[(tokens[-1], fold_text(university))].append(position)
+
+    groups = []
+    for (course, university, year), positions in courses.items():
+        if len(positions) >= min_rows:
+            queries = [' '.join(build(course, university, year).split()) for build in COHORT_QUERIES]
+            groups.append((f"{course} {year or ''}".strip(), list(dict.fromkeys(queries)), positions))
+    for (surname, university), positions in surnames.items():
+        if len(positions) >= min_rows:
+            groups.append((surname, [' '.join(SURNAME_QUERY(surname, university).split())], positions))
+    return groups
+
+def assign_matches(rows, positions, candidates, min_name_confidence=MIN_NAME_CONFIDENCE,
+                   min_confidence=MIN_COHORT_CONFIDENCE):
+    """{position: (url, confidence)} for rows with one conclusive candidate that no other row claims.
+
+    Candidates are ranked on the name alone; a row whose two best candidates
+    tie, or whose best candidate is also the best for another row, is left
+    alone for its own search, and so is a row whose full score (course and
+    university included) stays below `min_confidence`.
+    """
+    best = {}
+    claims = defaultdict(int)
+    for position in positions:
+        name = str(rows[position].get('Nome') or '')
+        conclusive = [(confidence, candidate) for confidence, candidate in rank_candidates(candidates, name)
+                      if confidence >= min_name_confidence]
+        if not conclusive or (len(conclusive) > 1 and conclusive[1][0] == conclusive[0][0]):
+            continue
+        best[position] = conclusive[0][1]
+        claims[conclusive[0][1]['url']] += 1
+    matches = {}
+    for position, candidate in best.items():
+        if claims[candidate['url']] == 1:
+            row = rows[position]
+            confidence = score_candidate(candidate, str(row.get('Nome') or ''), str(row.get('Curso') or ''),
+                                         str(row.get('Faculdade') or ''))
+            if confidence >= min_confidence:
+                matches[position] = (candidate['url'], confidence)
+    return matches
+
+class CohortHarvester:
+    """Finds profiles for whole cohorts with a few broad queries before the per-row searches.
+
+    Each chunk of pending rows is grouped by course cohort and by shared
+    surname (see cohort_groups); a group's broad queries collect every LinkedIn
+    candidate they return, and the candidates are matched in bulk against all
+    of the group's unmatched rows. Only conclusive, unambiguous matches backed
+    by the course or university settle a row; the leftovers go on to the
+    regular per-row search.
+    """
+
+    def __init__(self, search_query, pool, pacer, min_rows=MIN_COHORT_ROWS, min_name_confidence=MIN_NAME_CONFIDENCE,
+                 min_confidence=MIN_COHORT_CONFIDENCE):
+        self.search_query = search_query
+        self.pool = pool
+        self.pacer = pacer
+        self.min_rows = min_rows
+        self.min_name_confidence = min_name_confidence
+        self.min_confidence = min_confidence
+        self.queries = 0
+        self.matched = 0
+        self.blocked = False
+
+    def harvest(self, rows, deadline=None):
+        """{position: (url, confidence)} of the rows settled by broad queries."""
+        matches = {}
+        for label, queries, positions in cohort_groups(rows, self.min_rows):
+            candidates = {}
+            for query in queries:
+                open_positions = [p for p in positions if p not in matches]
+                if len(open_positions) < self.min_rows:
+                    break
+                if self.blocked or (deadline is not None and time.time() >= deadline):
+                    return matches
+                if self.queries:
+                    with span('pacing'):
+                        self.pacer.wait()
+                try:
+                    with span('cohort'):
+                        with self.pool.session() as client:
+                            found = self.search_query(client, query)
+                except SearchBlocked as e:
+                    print(f"      🚫 Bloqueio detectado na busca por coorte: {e}")
+                    self.pacer.observe('blocked')
+                    self.blocked = True
+                    return matches
+                self.queries += 1
+                self.pacer.observe('error' if found is None else 'ok' if found else 'empty')
+                for candidate in found or ():
+                    candidates.setdefault(candidate['url'], candidate)
+                new = assign_matches(rows, open_positions, list(candidates.values()), self.min_name_confidence,
+                                     self.min_confidence)
+                taken = {url for url, _ in matches.values()}
+                new = {p: match for p, match in new.items() if match[0] not in taken}
+                matches.update(new)
+                print(f"🧺 Coorte '{label}': {len(new)}/{len(open_positions)} perfis com uma busca ampla")
+        return matches
+
+    def filter_chunks(self, chunks, on_match, deadline=None):
+        """Yield each DataFrame chunk without the rows its cohorts settled; `on_match(row, url, confidence)` saves them."""
+        for chunk in chunks:
+            rows = chunk.to_dict('records')
+            matches = self.harvest(rows, deadline)
+            for position, (linkedin_url, confidence) in sorted(matches.items()):
+                on_match(rows[position], linkedin_url, confidence)
+            self.matched += len(matches)
+            if matches:
+                chunk = chunk.drop(index=[chunk.index[position] for position in matches])
+            if len(chunk):
+                yield chunk
+
+    def summary(self):
+        """One line with the queries spent and profiles found, or '' if no broad query ran."""
+        if not self.queries:
+            return ''
+        return (f"🧺 Busca por coorte: {self.matched} perfis com {self.queries} buscas amplas "
+                f"({self.matched / self.queries:.1f} perfis por busca)")
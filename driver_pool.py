@@ -0,0 +1,155 @@
+import contextlib
+import queue
+import threading
+
+try:
+    import psutil
+except ImportError:  # memory-based recycling is skipped without psutil
+    psutil = None
+
+# Recycle a session after this many queries or once its browser uses this much memory
+MAX_QUERIES_PER_SESSION = 200
+MAX_SESSION_MEMORY_MB = 1500
+
+def driver_is_alive(driver):
+    """Check that a Chrome session still answers commands."""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+_warned_no_psutil = False
+
+def driver_memory_mb(driver):
+    """Resident memory of chromedriver and all its Chrome processes, or None if unknown."""
+    global _warned_no_psutil
+    if psutil is None:
+        if not _warned_no_psutil:
+            _warned_no_psutil = True
+            print(f"⚠️  psutil não instalado: sessões serão recicladas só a cada {MAX_QUERIES_PER_SESSION} buscas, "
+                  f"sem o limite de {MAX_SESSION_MEMORY_MB} MB de memória (pip install psutil)")
+        return None
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        processes = [process] + process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except Exception:
+        return None
+
+class PooledSession:
+    """A search session plus the bookkeeping the pool needs to decide when to recycle it."""
+
+    def __init__(self, client):
+        self.client = client
+        self.queries = 0
+
+class SessionPool:
+    """Pool of pre-warmed search sessions (Chrome drivers or HTTP sessions).
+
+    Sessions are recycled after `max_queries` queries or when `memory_mb(client)`
+    exceeds `max_memory_mb`, and dead ones (per `is_alive(client)`) are replaced
+    on checkout, so callers never see a broken session. Once the pool is closed,
+    sessions still checked out are closed as they come back.
+    """
+
+    def __init__(self, setup, close, size=1, max_queries=MAX_QUERIES_PER_SESSION,
+                 max_memory_mb=MAX_SESSION_MEMORY_MB, is_alive=None, memory_mb=None, setup_retries=3):
+        self.setup = setup
+        self.close_client = close
+        self.size = size
+        self.max_queries = max_queries
+        self.max_memory_mb = max_memory_mb
+        self.is_alive = is_alive
+        self.memory_mb = memory_mb
+        self.setup_retries = setup_retries
+        self.idle = queue.Queue()
+        self.recycled = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def _create(self):
+        for _ in range(self.setup_retries):
+            client = self.setup()
+            if client:
+                return PooledSession(client)
+        raise RuntimeError("não foi possível iniciar uma sessão de busca")
+
+    def _destroy(self, session):
+        try:
+            self.close_client(session.client)
+        except Exception:
+            pass
+
+    def prewarm(self):
+        """Start all sessions up front, in parallel. Returns how many started."""
+        sessions = []
+
+        def start():
+            try:
+                session = self._create()
+            except RuntimeError:
+                return
+            with self._lock:
+                sessions.append(session)
+
+        threads = [threading.Thread(target=start) for _ in range(self.size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for session in sessions:
+            self.idle.put(session)
+        return len(sessions)
+
+    def _needs_recycle(self, session):
+        if session.queries >= self.max_queries:
+            return True
+        if self.is_alive is not None and not self.is_alive(session.client):
+            return True
+        if self.memory_mb is not None and self.max_memory_mb:
+            memory = self.memory_mb(session.client)
+            if memory is not None and memory > self.max_memory_mb:
+                return True
+        return False
+
+    def acquire(self):
+        """Check out a healthy session, replacing it first if it is dead or worn out."""
+        if self.closed:
+            raise RuntimeError("o pool de sessões já foi encerrado")
+        try:
+            session = self.idle.get_nowait()
+        except queue.Empty:
+            return self._create()
+        if self._needs_recycle(session):
+            self._destroy(session)
+            with self._lock:
+                self.recycled += 1
+            return self._create()
+        return session
+
+    def release(self, session):
+        session.queries += 1
+        with self._lock:
+            if not self.closed:
+                self.idle.put(session)
+                return
+        self._destroy(session)
+
+    @contextlib.contextmanager
+    def session(self):
+        """`with pool.session() as client:` for a single query."""
+        session = self.acquire()
+        try:
+            yield session.client
+        finally:
+            self.release(session)
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+        while True:
+            try:
+                self._destroy(self.idle.get_nowait())
+            except queue.Empty:
+                return
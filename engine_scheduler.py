@@ -0,0 +1,143 @@
+import threading
+import time
+from metrics import span
+from search_backends import SEARCH_ENGINES, SearchBlocked, search_query_candidates_http
+
+# Weight of the newest sample in each engine's smoothed latency
+LATENCY_ALPHA = 0.2
+
+# A blocked engine rests this long, doubling with each consecutive block
+BLOCK_COOLDOWN = 60.0
+MAX_BLOCK_COOLDOWN = 1800.0
+
+# This many errors in a row rest an engine for ERROR_COOLDOWN seconds
+MAX_ERRORS = 3
+ERROR_COOLDOWN = 30.0
+
+class EngineState:
+    """Budget and health of one search engine, as the scheduler tracks it."""
+
+    def __init__(self, name, rate):
+        self.name = name
+        self.rate = rate
+        self.latency = None
+        self.next_at = 0.0
+        self.resting_until = 0.0
+        self.consecutive_blocks = 0
+        self.consecutive_errors = 0
+        self.queries = 0
+        self.failures = 0
+
+class EngineScheduler:
+    """Spreads queries over several search engines by latency and health, failing over on errors.
+
+    Each engine keeps its own request budget (queries spaced 1/rate apart), so
+    together they allow the sum of the budgets. A query goes to the usable
+    engine expected to answer first: its next free slot plus its smoothed
+    latency. Block pages rest an engine for a cool-down that doubles with each
+    consecutive block; a run of errors rests it briefly.
+    """
+
+    def __init__(self, engines=None, rates=None, block_cooldown=BLOCK_COOLDOWN):
+        names = engines or list(SEARCH_ENGINES)
+        unknown = [name for name in names if name not in SEARCH_ENGINES]
+        if unknown:
+            raise ValueError(f"buscador desconhecido: {', '.join(unknown)}")
+        rates = rates or {}
+        self.engines = {name: EngineState(name, rates.get(name, SEARCH_ENGINES[name][2])) for name in names}
+        self.block_cooldown = block_cooldown
+        self._lock = threading.Lock()
+
+    @property
+    def total_rate(self):
+        """Requests per second all engines allow together."""
+        return sum(engine.rate for engine in self.engines.values())
+
+    def reserve(self, exclude=()):
+        """(engine, seconds to wait) for the next query, skipping `exclude`; (None, 0) if no engine is usable.
+
+        The engine's slot is taken right away, so concurrent callers spread
+        over the engines instead of piling onto the fastest one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            usable = [engine for name, engine in self.engines.items()
+                      if name not in exclude and engine.resting_until <= now]
+            if not usable:
+                return None, 0.0
+            engine = min(usable, key=lambda e: max(now, e.next_at) + (e.latency or 0.0))
+            start = max(now, engine.next_at)
+            engine.next_at = start + 1 / engine.rate
+            engine.queries += 1
+            return engine.name, start - now
+
+    def observe(self, name, outcome, seconds=None):
+        """Feed one query's outcome ('ok', 'empty', 'error' or 'blocked') and latency."""
+        now = time.monotonic()
+        with self._lock:
+            engine = self.engines[name]
+            if seconds is not None and outcome in ('ok', 'empty'):
+                engine.latency = seconds if engine.latency is None else (
+                    LATENCY_ALPHA * seconds + (1 - LATENCY_ALPHA) * engine.latency)
+            if outcome == 'blocked':
+                engine.failures += 1
+                engine.consecutive_blocks += 1
+                pause = min(MAX_BLOCK_COOLDOWN, self.block_cooldown * 2 ** (engine.consecutive_blocks - 1))
+                engine.resting_until = max(engine.resting_until, now + pause)
+            elif outcome == 'error':
+                engine.failures += 1
+                engine.consecutive_errors += 1
+                if engine.consecutive_errors >= MAX_ERRORS:
+                    engine.consecutive_errors = 0
+                    engine.resting_until = max(engine.resting_until, now + ERROR_COOLDOWN)
+            else:
+                engine.consecutive_blocks = 0
+                engine.consecutive_errors = 0
+
+    def summary(self):
+        """One line per engine with its queries, failures and latency."""
+        now = time.monotonic()
+        lines = ["🔀 Buscadores:"]
+        with self._lock:
+            for engine in self.engines.values():
+                latency = f"{engine.latency:.2f}s" if engine.latency is not None else "-"
+                resting = f", em pausa por {engine.resting_until - now:.0f}s" if engine.resting_until > now else ""
+                lines.append(f"   {engine.name:<11} {engine.queries:5d} consultas, {engine.failures} falhas, "
+                             f"latência {latency}{resting}")
+        return '\n'.join(lines)
+
+def engine_search(scheduler, search_query=search_query_candidates_http):
+    """Query-level search (client, query) over the scheduler's engines, failing over on errors and blocks.
+
+    An empty result is an answer and is not retried elsewhere. Returns None
+    if every engine errored; raises SearchBlocked if every engine is blocked
+    or resting, so the caller's pacer backs off.
+    """
+    def search(client, query):
+        tried = set()
+        blocked = 0
+        while True:
+            name, wait = scheduler.reserve(tried)
+            if name is None:
+                break
+            tried.add(name)
+            if wait > 0:
+                with span('pacing'):
+                    time.sleep(wait)
+            start = time.perf_counter()
+            try:
+                candidates = search_query(client, query, name)
+            except SearchBlocked as e:
+                print(f"      🚫 {name} bloqueou: {e} - tentando outro buscador")
+                scheduler.observe(name, 'blocked')
+                blocked += 1
+                continue
+            if candidates is None:
+                scheduler.observe(name, 'error')
+                continue
+            scheduler.observe(name, 'ok' if candidates else 'empty', time.perf_counter() - start)
+            return candidates
+        if len(tried) == blocked:
+            raise SearchBlocked("todos os buscadores bloqueados ou em pausa")
+        return None
+    return search
@@ -0,0 +1,157 @@
+import csv
+import functools
+from datetime import datetime
+from names import person_key
+
+# pandas is imported inside the functions that build or take DataFrames, so
+# stdlib-only callers (check_progress, the CLI's --help) start without it
+
+DATE_COLUMN = 'Data da Colação'
+DATE_FORMAT = '%d/%m/%Y'
+
+def recent_cutoff_year():
+    """Oldest graduation year still considered recent (previous year)."""
+    return datetime.now().year - 1
+
+def graduation_years(dates):
+    """Vectorized graduation year for a Series of DD/MM/YYYY strings (NaN when unparseable).
+
+    Rosters repeat a handful of ceremony dates, so only the unique values are
+    parsed and the result is mapped back onto the column.
+    """
+    import pandas as pd
+    unique_dates = pd.Series(dates.dropna().unique())
+    parsed = pd.to_datetime(unique_dates, format=DATE_FORMAT, errors='coerce')
+    year_by_date = dict(zip(unique_dates, parsed.dt.year))
+    return dates.map(year_by_date)
+
+def recent_graduate_mask(dates):
+    """Boolean mask of graduates from the current or previous year."""
+    return graduation_years(dates) >= recent_cutoff_year()
+
+def filter_recent_graduates(df):
+    """Rows of df from recent graduates, with the parsed year cached in 'Ano Colação'."""
+    if 'Ano Colação' not in df.columns:
+        df['Ano Colação'] = graduation_years(df[DATE_COLUMN])
+    return df[df['Ano Colação'] >= recent_cutoff_year()]
+
+@functools.lru_cache(maxsize=None)
+def graduation_year(graduation_date_str):
+    """Graduation year of a single DD/MM/YYYY string, or None if it can't be parsed."""
+    try:
+        return datetime.strptime(graduation_date_str, DATE_FORMAT).year
+    except Exception:
+        return None
+
+def is_recent_graduate(graduation_date_str):
+    """Check if graduate is from current year or previous year."""
+    year = graduation_year(graduation_date_str)
+    return year is not None and year >= recent_cutoff_year()
+
+def person_keys(chunk):
+    """Person key (see names.person_key) of every row of a roster chunk."""
+    return [person_key(name, date) for name, date in zip(chunk['Nome'], chunk[DATE_COLUMN])]
+
+def known_mask(chunk, index):
+    """Boolean mask of the chunk's graduates already in a NameIndex."""
+    import pandas as pd
+    return pd.Series(index.contains_many(chunk['Nome'], chunk[DATE_COLUMN]), index=chunk.index)
+
+def first_occurrences(chunk, seen):
+    """Mask of rows whose person was not seen earlier in the pass; adds them to `seen` (a set of keys)."""
+    import pandas as pd
+    mask = []
+    for key in person_keys(chunk):
+        mask.append(key not in seen)
+        seen.add(key)
+    return pd.Series(mask, index=chunk.index, dtype=bool)
+
+# Rows per read_csv chunk when streaming the roster
+CHUNK_SIZE = 10000
+
+def iter_recent_graduates(path, chunksize=CHUNK_SIZE, encoding='utf-8', read_chunks=None):
+    """Stream the roster, yielding (chunk row count, recent graduates in the chunk).
+
+    `read_chunks(chunksize)` replaces reading the CSV at `path` with another
+    source of roster DataFrames (e.g. RosterSnapshot.changed_chunks).
+    """
+    if read_chunks is None:
+        import pandas as pd
+        chunks = pd.read_csv(path, encoding=encoding, chunksize=chunksize, dtype=str)
+    else:
+        chunks = read_chunks(chunksize)
+    for chunk in chunks:
+        yield len(chunk), filter_recent_graduates(chunk)
+
+def count_graduates(path, is_pending, chunksize=CHUNK_SIZE, encoding='utf-8', read_chunks=None):
+    """Count total, recent and pending rows at constant memory.
+
+    `is_pending(chunk)` returns a boolean mask of rows that still need a search;
+    a person listed twice in the roster is pending only once.
+    """
+    total = recent = pending = 0
+    seen = set()
+    for chunk_rows, recent_chunk in iter_recent_graduates(path, chunksize, encoding, read_chunks):
+        total += chunk_rows
+        recent += len(recent_chunk)
+        pending_chunk = recent_chunk[is_pending(recent_chunk)]
+        pending += int(first_occurrences(pending_chunk, seen).sum())
+    return total, recent, pending
+
+def count_graduates_csv(path, is_known, encoding='utf-8'):
+    """count_graduates() with the csv module, for callers that should not load pandas.
+
+    `is_known(name, graduation_date)` tells which recent graduates need no
+    search (e.g. NameIndex.contains); returns (total, recent, pending).
+    """
+    total = recent = pending = 0
+    seen = set()
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        for row in csv.DictReader(f):
+            total += 1
+            name, graduation_date = row.get('Nome') or '', row.get(DATE_COLUMN) or ''
+            if not is_recent_graduate(graduation_date):
+                continue
+            recent += 1
+            key = person_key(name, graduation_date)
+            if key not in seen and not is_known(name, graduation_date):
+                pending += 1
+            seen.add(key)
+    return total, recent, pending
+
+def iter_pending_graduates(path, is_pending, limit=None, chunksize=CHUNK_SIZE, encoding='utf-8', read_chunks=None):
+    """Yield DataFrame chunks of recent graduates still pending, up to `limit` rows in total.
+
+    Reading stops as soon as the limit is reached, so a small batch never
+    touches the rest of the file. Repeated people are yielded once.
+    """
+    remaining = limit
+    seen = set()
+    for _, recent_chunk in iter_recent_graduates(path, chunksize, encoding, read_chunks):
+        pending = recent_chunk[is_pending(recent_chunk)]
+        pending = pending[first_occurrences(pending, seen)]
+        if remaining is not None:
+            pending = pending.head(remaining)
+            remaining -= len(pending)
+        if len(pending):
+            yield pending
+        if remaining == 0:
+            return
+
+def iter_rows(chunks):
+    """Flatten DataFrame chunks into row dicts."""
+    for chunk in chunks:
+        for row in chunk.to_dict('records'):
+            yield row
+
+def rebatch(chunks, batch_size):
+    """Re-slice a stream of DataFrame chunks into batches of exactly batch_size (last may be smaller)."""
+    import pandas as pd
+    buffer = None
+    for chunk in chunks:
+        buffer = chunk if buffer is None else pd.concat([buffer, chunk])
+        while len(buffer) >= batch_size:
+            yield buffer.iloc[:batch_size]
+            buffer = buffer.iloc[batch_size:]
+    if buffer is not None and len(buffer):
+        yield buffer
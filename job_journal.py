@@ -0,0 +1,100 @@
+import json
+import sqlite3
+import threading
+import time
+from search_cache import normalize_query
+
+JOURNAL_FILE = 'job_journal.db'
+
+# Row outcomes that count as done; errored rows are searched again on resume
+DONE_STATUSES = ('found', 'not_found')
+
+def row_key(row):
+    """Journal key of a roster row: its normalized (name, university) query.
+
+    The cells go to normalize_query as read, like pending_filter does, so a
+    blank university (NaN in pandas) keys as '' on both sides.
+    """
+    return normalize_query(str(row.get('Nome') or '').strip(), row.get('Faculdade'))
+
+class JobJournal:
+    """Durable per-row log of search jobs, so an interrupted job resumes exactly where it stopped.
+
+    Each job keeps the settings it was started with; each searched row is
+    committed as soon as its outcome is known. Callers write a find to the
+    master store before journaling its row, so a row marked done never
+    loses its find.
+    """
+
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                settings TEXT NOT NULL,
+                status TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_rows (
+                job_id INTEGER NOT NULL,
+                row_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                linkedin_url TEXT,
+                finished_at REAL NOT NULL,
+                PRIMARY KEY (job_id, row_key)
+            );
+        """)
+        self.conn.commit()
+
+    def start(self, settings):
+        """Open a new job with its run settings (a JSON-serializable dict). Returns the job id."""
+        now = time.time()
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (settings, status, started_at, updated_at) VALUES (?, 'running', ?, ?)",
+                (json.dumps(settings, ensure_ascii=False), now, now)
+            )
+            self.conn.commit()
+        return cursor.lastrowid
+
+    def last_unfinished(self):
+        """(job_id, settings) of the most recent job that did not complete, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT job_id, settings FROM jobs WHERE status != 'completed' ORDER BY job_id DESC LIMIT 1"
+            ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def set_status(self, job_id, status):
+        """Mark a job 'running', 'interrupted' or 'completed'."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?", (status, time.time(), job_id)
+            )
+            self.conn.commit()
+
+    def record(self, job_id, row, status, linkedin_url=None):
+        """Commit one row's outcome ('found', 'not_found' or 'error')."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO job_rows VALUES (?, ?, ?, ?, ?)",
+                (job_id, row_key(row), status, linkedin_url, time.time())
+            )
+            self.conn.commit()
+
+    def done_keys(self, job_id):
+        """Row keys the job already finished (found or not found)."""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT row_key FROM job_rows WHERE job_id = ? AND status IN ({', '.join('?' * len(DONE_STATUSES))})",
+                (job_id, *DONE_STATUSES)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def close(self):
+        self.conn.close()
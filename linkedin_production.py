@@ -1,22 +1,45 @@
-import pandas as pd
+import argparse
 import time
-import json
-import glob
-import uuid
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import re
+from datetime import datetime, timedelta
+from page_wait import wait_for_results, wait_summary
+from search_backends import (DDG_URL, SEARCH_ENGINES, SearchBlocked, browser_is_blocked,
+                             extract_linkedin_candidates_in_browser, setup_http_session, search_query_candidates_http)
+from match_scoring import best_match
+from query_planner import QueryPlanner, planned_search
+from search_cache import SearchCache, cached_search, normalize_query
+from master_store import MasterStore, MASTER_FILE, STORE_FILE
+from driver_pool import SessionPool, driver_is_alive, driver_memory_mb
+from graduates import count_graduates, is_recent_graduate, iter_pending_graduates, iter_rows, known_mask, rebatch
+from names import NameIndex
+from async_search import search_rows
+from cohort_search import CohortHarvester
+from engine_scheduler import EngineScheduler, engine_search
+from rate_limit import AdaptivePacer, DEFAULT_HOST_RATE
+from job_journal import JobJournal, JOURNAL_FILE
+from sharding import merge_partials, parse_shard, shard_mask, shard_path
+from progress_stats import ProgressStats, STATS_FILE
+from roster_snapshot import RosterSnapshot, SNAPSHOT_FILE
+from metrics import METRICS_FILE, PROMETHEUS_FILE, close_sink, metrics_summary, open_sink, span
 import os
-import random
+import queue
+import threading
+
+# Upper bound on parallel search sessions in worker-pool mode
+MAX_WORKERS = 8
+
+# Seconds an interrupted run waits for the workers to finish their queries before closing the sessions
+WORKER_STOP_TIMEOUT = 15
+
+# Upper bound on in-flight queries in the asyncio HTTP pipeline
+MAX_ASYNC_CONCURRENCY = 32
 
 def setup_driver():
     """Setup Chrome driver optimized for production."""
+    # Selenium is only loaded by the browser backend; --help, --merge and the http backend start without it
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    
     chrome_options = Options()
     
     # Performance optimizations
@@ -45,138 +68,121 @@ def setup_driver():
         print(f"❌ Error setting up driver: {e}")
         return None
 
-def generate_unique_id(existing_ids):
-    """Generate a unique ID that doesn't exist in the current dataset."""
-    import uuid
-    while True:
-        new_id = str(uuid.uuid4())[:8]  # Use first 8 characters of UUID
-        if new_id not in existing_ids:
-            return new_id
+def save_result(result, store, journal, job_id):
+    """Persist one searched row as soon as it is done.
+    
+    A find is committed to the master store (recent graduates only) before the
+    row is journaled, so a row the journal marks done never loses its find.
+    Returns (status, added): the journal status and whether the find was new.
+    """
+    status = {'Found': 'found', 'Not Found': 'not_found'}.get(result['Match Status'], 'error')
+    added = False
+    with span('save'):
+        if status == 'found' and is_recent_graduate(result.get('Data da Colação', '')):
+            added = store.add(result)
+        journal.record(job_id, result, status, result['LinkedIn URL'] or None)
+    return status, added
 
-def is_recent_graduate(graduation_date_str):
-    """Check if graduate is from current year (2025) or previous year (2024)."""
+def export_master_file(store):
+    """Write the master JSON (linkedin_success_master.json by default) from the store."""
     try:
-        from datetime import datetime
-        current_year = datetime.now().year
-        
-        # Parse the graduation date (DD/MM/YYYY format)
-        graduation_date = datetime.strptime(graduation_date_str, '%d/%m/%Y')
-        graduation_year = graduation_date.year
-        
-        # Only accept graduates from current year or previous year
-        return graduation_year >= current_year - 1  # 2024 and 2025
-        
-    except Exception:
-        # If date parsing fails, exclude the record
-        return False
+        total = store.export_json()
+        print(f"💾 {store.master_file} exportado: {total} perfis")
+    except Exception as e:
+        print(f"❌ Erro ao exportar {store.master_file}: {e}")
 
-def update_master_success_file(new_success_records, existing_data):
-    """Update the master success file with new records and unique IDs (recent graduates only)."""
-    master_file = 'linkedin_success_master.json'
+def search_query_candidates(driver, query):
+    """Run one query and return every LinkedIn candidate ({'url', 'text'}) found ([] if none, None on error).
     
-    # Filter existing data to only include recent graduates
-    recent_existing_data = [
-        record for record in existing_data 
-        if is_recent_graduate(record.get('Data da Colação', ''))
-    ]
+    Raises SearchBlocked on a challenge page, so the caller can back off.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
     
-    # Get existing URLs and IDs from recent graduates only
-    existing_urls = {record.get('LinkedIn URL', '') for record in recent_existing_data}
-    existing_ids = {record.get('id', '') for record in recent_existing_data if record.get('id')}
-    
-    # Add new successful records with unique IDs (only recent graduates)
-    added_count = 0
-    for record in new_success_records:
-        linkedin_url = record.get('LinkedIn URL', '')
-        graduation_date = record.get('Data da Colação', '')
-        
-        # Only add if it's a recent graduate and URL is not already present
-        if (linkedin_url and linkedin_url not in existing_urls and 
-            is_recent_graduate(graduation_date)):
+    try:
+        with span('navigate'):
+            # Navigate to DuckDuckGo
+            driver.get(DDG_URL)
             
-            # Generate unique ID for this profile
-            unique_id = generate_unique_id(existing_ids)
-            existing_ids.add(unique_id)
+            # Find and use search box
+            search_box = WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.NAME, "q"))
+            )
             
-            recent_existing_data.append({
-                'id': unique_id,
-                'Nome': record['Nome'],
-                'Curso': record['Curso'],
-                'Faculdade': record['Faculdade'],
-                'Data da Colação': graduation_date,
-                'LinkedIn URL': linkedin_url,
-                'Last Updated': record['Last Updated']
-            })
-            existing_urls.add(linkedin_url)
-            added_count += 1
-    
-    # Save updated master file (only recent graduates)
-    try:
-        with open(master_file, 'w', encoding='utf-8') as f:
-            json.dump(recent_existing_data, f, ensure_ascii=False, indent=2)
-        
-        if added_count > 0:
-            print(f"   📅 Adicionados {added_count} formandos recentes (2024-2025) ao arquivo mestre")
-        
-        return len(recent_existing_data)
-    except Exception as e:
-        print(f"❌ Erro ao salvar arquivo mestre: {e}")
-        return len(recent_existing_data)
-
-def search_linkedin_profile(driver, name, university):
-    """Search for LinkedIn profile with optimized query."""
-    query = f"linkedin {name} {university}"
-    
-    try:
-        # Navigate to DuckDuckGo
-        driver.get("https://duckduckgo.com")
-        
-        # Find and use search box
-        search_box = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.NAME, "q"))
-        )
-        
-        search_box.clear()
-        search_box.send_keys(query)
-        search_box.submit()
-        
-        # Wait for results
-        time.sleep(2)
-        
-        # Parse results
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        # Extract LinkedIn URLs
-        linkedin_urls = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if 'linkedin.com/in/' in href:
-                if '/l/?uddg=' in href:
-                    try:
-                        import urllib.parse
-                        actual_url = urllib.parse.unquote(href.split('uddg=')[1])
-                        if actual_url.startswith('http'):
-                            linkedin_urls.append(actual_url)
-                    except:
-                        pass
-                elif href.startswith('http'):
-                    linkedin_urls.append(href)
-        
-        # Clean and return best result
-        clean_urls = []
-        for url in linkedin_urls:
-            clean_url = url.split('?')[0].split('#')[0]
-            if clean_url not in clean_urls and 'linkedin.com/in/' in clean_url:
-                clean_urls.append(clean_url)
-        
-        return clean_urls[0] if clean_urls else None
-        
+            search_box.clear()
+            search_box.send_keys(query)
+            search_box.submit()
+        
+        # Wait until results render (bounded), instead of a fixed sleep
+        with span('wait'):
+            wait_for_results(driver)
+        
+        # Extract links in the browser instead of parsing page_source
+        with span('parse'):
+            candidates = extract_linkedin_candidates_in_browser(driver)
+        if not candidates and browser_is_blocked(driver):
+            raise SearchBlocked("página de desafio")
+        return candidates
+        
+    except SearchBlocked:
+        raise
     except Exception as e:
         print(f"      Search error: {e}")
         return None
 
-def process_batch(driver, df_batch, batch_num, total_batches, existing_names=None):
-    """Process a batch of records with smart skipping."""
+def close_driver(driver):
+    """Close a Chrome session."""
+    driver.quit()
+
+def close_http_session(session):
+    """Close a pooled HTTP session."""
+    session.close()
+
+# Pluggable search backends: name -> (setup, search(client, query) returning candidates, close).
+# 'multi' spreads queries over several engines (see engine_scheduler); run_job gives it the job's engines.
+SEARCH_BACKENDS = {
+    'selenium': (setup_driver, search_query_candidates, close_driver),
+    'http': (setup_http_session, search_query_candidates_http, close_http_session),
+    'multi': (setup_http_session, engine_search(EngineScheduler()), close_http_session),
+}
+
+# Backends on plain HTTP sessions, which use the asyncio pipeline when run in parallel
+HTTP_BACKENDS = ('http', 'multi')
+
+def make_session_pool(backend, size):
+    """Session pool for a backend; Chrome sessions get health and memory checks."""
+    setup, _, close = SEARCH_BACKENDS[backend]
+    if backend == 'selenium':
+        return SessionPool(setup, close, size, is_alive=driver_is_alive, memory_mb=driver_memory_mb)
+    return SessionPool(setup, close, size)
+
+def build_result(name, course, university, graduation_date, linkedin_url, confidence=None):
+    """Build the result record for one searched graduate."""
+    return {
+        'Nome': name,
+        'Curso': course,
+        'Faculdade': university,
+        'Data da Colação': graduation_date,
+        'LinkedIn URL': linkedin_url or '',
+        'Confidence': confidence,
+        'Match Status': 'Found' if linkedin_url else 'Not Found',
+        'Last Updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def match_result(row, candidates):
+    """Rank the candidates against the graduate and build the result record."""
+    name = row.get('Nome', '').strip()
+    course = row.get('Curso', '')
+    university = row.get('Faculdade', '')
+    linkedin_url, confidence = best_match(candidates, name, course, university)
+    result = build_result(name, course, university, row.get('Data da Colação', ''), linkedin_url, confidence)
+    if candidates is None:
+        result['Match Status'] = 'Error'
+    return result
+
+def process_batch(pool, df_batch, batch_num, total_batches, existing_names, search, save, pacer):
+    """Process a batch of records with smart skipping, saving each row via `save(result)`."""
     print(f"\n📦 Lote {batch_num}/{total_batches} - Processando {len(df_batch)} registros")
     print("-" * 60)
     
@@ -197,39 +203,34 @@ def process_batch(driver, df_batch, batch_num, total_batches, existing_names=Non
             continue
         
         # Skip if already processed (double-check for production mode)
-        if existing_names and name in existing_names:
+        if existing_names and existing_names.contains(name, graduation_date):
             print("⏭️  Já processado")
             skipped_count += 1
             continue
         
         # Search for LinkedIn profile
-        linkedin_url = search_linkedin_profile(driver, name, university)
-        
-        # Prepare result
-        result = {
-            'Nome': name,
-            'Curso': course,
-            'Faculdade': university,
-            'Data da Colação': graduation_date,
-            'LinkedIn URL': linkedin_url or '',
-            'Match Status': 'Found' if linkedin_url else 'Not Found',
-            'Last Updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        with pool.session() as driver:
+            candidates = search(driver, name, university, course)
+        
+        # Prepare result from the best-ranked candidate
+        result = match_result(row, candidates)
+        linkedin_url = result['LinkedIn URL']
         
         results.append(result)
+        save(result)
         
         if linkedin_url:
-            print(f"✅ Encontrado")
+            print(f"✅ Encontrado ({result['Confidence']:.2f})")
             found_count += 1
             # Add to existing names to avoid future duplicates in same session
             if existing_names is not None:
-                existing_names.add(name)
+                existing_names.add(name, graduation_date)
         else:
             print(f"❌ Não encontrado")
         
-        # Random delay to avoid rate limiting
-        delay = random.uniform(2, 4)
-        time.sleep(delay)
+        # Adaptive delay: shrinks while searches succeed, backs off on blocks
+        with span('pacing'):
+            pacer.wait()
     
     processed_count = len(df_batch) - skipped_count
     if skipped_count > 0:
@@ -239,73 +240,222 @@ def process_batch(driver, df_batch, batch_num, total_batches, existing_names=Non
     
     return results, found_count
 
-def load_existing_results():
-    """Load existing success results from the master file (recent graduates only)."""
-    existing_names = set()
-    existing_urls = set()
-    existing_data = []
-    
-    master_file = 'linkedin_success_master.json'
-    
-    if os.path.exists(master_file):
-        try:
-            with open(master_file, 'r', encoding='utf-8') as f:
-                all_data = json.load(f)
-            
-            # Filter to only include recent graduates (2024-2025)
-            recent_data = []
-            for record in all_data:
-                graduation_date = record.get('Data da Colação', '')
-                if is_recent_graduate(graduation_date):
-                    recent_data.append(record)
-                    existing_names.add(record.get('Nome', '').strip())
-                    existing_urls.add(record.get('LinkedIn URL', '').strip())
+def search_worker(worker_id, row_queue, result_queue, stop_event, pool, search, pacer):
+    """Worker loop: search rows pulled from the shared queue with sessions from the pool."""
+    try:
+        while not stop_event.is_set():
+            row = row_queue.get()
+            if row is None:
+                break
             
-            existing_data = recent_data
+            name = row.get('Nome', '').strip()
+            with pool.session() as driver:
+                candidates = search(driver, name, row.get('Faculdade', ''), row.get('Curso', ''))
+            result = match_result(row, candidates)
+            result_queue.put(('result', worker_id, result))
             
-            # If we filtered out old graduates, update the master file
-            if len(recent_data) < len(all_data):
-                filtered_count = len(all_data) - len(recent_data)
-                print(f"🔄 Filtrados {filtered_count} formandos mais antigos (mantendo apenas 2024-2025)")
-                
-                # Save the filtered data back to master file
-                with open(master_file, 'w', encoding='utf-8') as f:
-                    json.dump(recent_data, f, ensure_ascii=False, indent=2)
+            # Each session keeps its own pacing, so throughput scales with the worker count
+            with span('pacing'):
+                stop_event.wait(pacer.next_delay())
+    except RuntimeError:
+        result_queue.put(('error', worker_id, None))
+    finally:
+        result_queue.put(('done', worker_id, None))
+
+def feed_rows(rows, row_queue, workers, stop_event):
+    """Producer: stream rows into the bounded work queue, then one stop sentinel per worker."""
+    for row in rows:
+        if stop_event.is_set():
+            break
+        if str(row.get('Nome') or '').strip():
+            row_queue.put(row)
+    for _ in range(workers):
+        row_queue.put(None)
+
+def process_parallel(rows, expected, existing_names, save, workers, search, pacer, backend='selenium'):
+    """Search streamed rows with a pool of search workers feeding a single writer.
+    
+    `search(client, name, university, course)` is the per-graduate search shared by all workers;
+    the main thread saves every result with `save(result)` as it arrives.
+    """
+    workers = max(1, min(workers, MAX_WORKERS, expected))
+    row_queue = queue.Queue(maxsize=workers * 4)
+    result_queue = queue.Queue()
+    stop_event = threading.Event()
+    pending = expected
+    
+    # Searching starts while the roster is still being read
+    threading.Thread(target=feed_rows, args=(rows, row_queue, workers, stop_event), daemon=True).start()
+    
+    print(f"\n👷 Iniciando {workers} workers paralelos ({backend}) para {pending} registros")
+    pool = make_session_pool(backend, workers)
+    started = pool.prewarm()
+    if started < workers:
+        print(f"⚠️  Apenas {started}/{workers} sessões iniciadas; as demais serão criadas sob demanda")
+    
+    threads = [
+        threading.Thread(target=search_worker, args=(i + 1, row_queue, result_queue, stop_event, pool, search, pacer),
+                         daemon=True)
+        for i in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    
+    all_results = []
+    total_found = 0
+    running = workers
+    
+    try:
+        # The main thread is the only writer of the master file
+        while running:
+            kind, worker_id, result = result_queue.get()
+            if kind == 'error':
+                print(f"❌ Worker {worker_id} não pôde iniciar a sessão de busca")
+                continue
+            if kind == 'done':
+                running -= 1
+                continue
             
-            print(f"✅ Carregados {len(existing_data)} formandos recentes (2024-2025) de {master_file}")
+            all_results.append(result)
+            save(result)
+            status = f"✅ Encontrado ({result['Confidence']:.2f})" if result['LinkedIn URL'] else "❌ Não encontrado"
+            print(f"[{len(all_results):4d}/{pending}] w{worker_id} {result['Nome'][:35]:<35} {status}")
             
-        except Exception as e:
-            print(f"❌ Erro ao carregar {master_file}: {e}")
-            existing_data = []
-    else:
-        print("📝 Nenhum arquivo mestre existente encontrado - iniciando do zero")
-    
-    return existing_names, existing_urls, existing_data
+            if result['LinkedIn URL']:
+                total_found += 1
+                if existing_names is not None:
+                    existing_names.add(result['Nome'], result['Data da Colação'])
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Processo interrompido pelo usuário - encerrando workers...")
+        stop_event.set()
+        stop_deadline = time.time() + WORKER_STOP_TIMEOUT
+        for thread in threads:
+            thread.join(timeout=max(0, stop_deadline - time.time()))
+        # Sessions of workers still mid-query are closed when they are released
+        pool.close()
+        raise
+    
+    for thread in threads:
+        thread.join()
+    pool.close()
+    if pool.recycled:
+        print(f"♻️  {pool.recycled} sessões recicladas durante a execução")
+    
+    return all_results, total_found
 
-def main():
-    print("🚀 Busca de Produção LinkedIn")
-    print("=" * 50)
+def process_async(rows, expected, existing_names, save, concurrency, cache=None, planner=None, pacer=None,
+                  query_search=None):
+    """Search streamed rows with the asyncio HTTP pipeline, paced by a per-host token bucket.
+    
+    A blocking `query_search(session, query)` (the multi-engine search) replaces the
+    token-bucketed DuckDuckGo fetch and paces itself.
+    """
+    rows = (row for row in rows if str(row.get('Nome') or '').strip())
+    print(f"\n⚡ Pipeline assíncrono: até {concurrency} buscas simultâneas para {expected} registros")
+    
+    all_results = []
+    state = {'found': 0}
+    
+    def on_result(row, candidates):
+        name = row.get('Nome', '').strip()
+        result = match_result(row, candidates)
+        linkedin_url = result['LinkedIn URL']
+        all_results.append(result)
+        save(result)
+        status = f"✅ Encontrado ({result['Confidence']:.2f})" if linkedin_url else "❌ Não encontrado"
+        print(f"[{len(all_results):4d}/{expected}] {name[:35]:<35} {status}")
+        
+        if linkedin_url:
+            state['found'] += 1
+            if existing_names is not None:
+                existing_names.add(name, row.get('Data da Colação', ''))
     
-    # Load CSV
     try:
-        df = pd.read_csv('new_graduates.csv', encoding='utf-8')
-        print(f"📊 Carregados {len(df)} registros")
-    except Exception as e:
-        print(f"❌ Error loading CSV: {e}")
-        return
+        search_rows(rows, on_result, concurrency=concurrency, cache=cache, planner=planner, pacer=pacer,
+                    query_search=query_search)
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Processo interrompido pelo usuário")
+        raise
     
-    # Load existing results to avoid duplicates
-    existing_names, existing_urls, existing_data = load_existing_results()
+    return all_results, state['found']
+
+def load_existing_results(master_file=MASTER_FILE, store_file=STORE_FILE, seed_file=None):
+    """Open the master store and load existing successes (recent graduates only).
     
-    # Filter dataset to only include recent graduates (2024-2025)
-    df['is_recent'] = df['Data da Colação'].apply(is_recent_graduate)
-    recent_df = df[df['is_recent']].copy()
-    total_recent = len(recent_df)
+    A new store is seeded from `seed_file` when given (a shard node starts from
+    the shared master JSON, so it skips graduates already found).
+    """
+    store = MasterStore(store_file, master_file=master_file)
+    existing_names = NameIndex()
     
-    print(f"🎯 Filtrado para formandos recentes (2024-2025): {total_recent}/{len(df)} registros ({total_recent/len(df)*100:.1f}%)")
+    try:
+        if seed_file and store.count() == 0 and os.path.exists(seed_file):
+            store.import_json(seed_file)
+        
+        # Drop graduates older than 2024-2025 from the store
+        old_ids = []
+        for record in store.records():
+            if is_recent_graduate(record.get('Data da Colação', '')):
+                existing_names.add(record.get('Nome', ''), record.get('Data da Colação', ''))
+            else:
+                old_ids.append(record['id'])
+        
+        if old_ids:
+            store.remove(old_ids)
+            print(f"🔄 Filtrados {len(old_ids)} formandos mais antigos (mantendo apenas 2024-2025)")
+            store.export_json()
+        
+        if existing_names:
+            print(f"✅ Carregados {store.count()} formandos recentes (2024-2025) de {store.path}")
+        else:
+            print("📝 Nenhum arquivo mestre existente encontrado - iniciando do zero")
+        
+    except Exception as e:
+        print(f"❌ Erro ao carregar {store.path}: {e}")
     
-    # Get processing options based on recent graduates only
-    remaining_count = total_recent - len(existing_names)
+    return existing_names, store
+
+def print_master_summary(store):
+    """Show the current master store stats and the last profiles added."""
+    try:
+        total = store.count()
+        print(f"🎯 Arquivo mestre contém {total} perfis únicos do LinkedIn")
+        
+        # Show sample of found profiles
+        if total:
+            print(f"\n🎯 Amostra do arquivo mestre:")
+            for i, result in enumerate(store.records(last=10), 1):  # Show last 10 added
+                print(f"   {i:2d}. {result['Nome']:<30} -> {result['LinkedIn URL']}")
+            
+            if total > 10:
+                print(f"   ... total de {total} perfis no arquivo mestre")
+        
+    except Exception as e:
+        print(f"❌ Error reading master store: {e}")
+
+def rows_until(rows, deadline):
+    """Stop feeding rows once the deadline (epoch seconds) passes; in-flight searches still finish."""
+    for row in rows:
+        if time.time() >= deadline:
+            return
+        yield row
+
+def pending_filter(existing_names, skip_keys, shard=None):
+    """Build the chunk filter for rows still to search."""
+    def is_pending(chunk):
+        """This shard's rows not yet in the master store, without a fresh cached miss and not done by the resumed job."""
+        import pandas as pd
+        mask = ~known_mask(chunk, existing_names)
+        if shard:
+            mask &= shard_mask(chunk, shard)
+        if skip_keys:
+            query_keys = [normalize_query(str(n).strip(), u) for n, u in zip(chunk['Nome'], chunk['Faculdade'])]
+            mask &= pd.Series([k not in skip_keys for k in query_keys], index=chunk.index)
+        return mask
+    return is_pending
+
+def choose_count(remaining_count):
+    """Interactive menu: (max_count, label) for the run."""
     print(f"\nOpções de processamento ({remaining_count} registros recentes não processados restantes):")
     print(f"1. Teste rápido (próximos 10 recentes não processados)")
     print(f"2. Lote pequeno (próximos 50 recentes não processados)")
@@ -316,222 +466,485 @@ def main():
     
     choice = input("\nEscolha uma opção (1-6): ").strip()
     
-    # Helper function to get next unprocessed recent graduates
-    def get_next_unprocessed(df, existing_names, max_count):
-        """Get the next unprocessed recent graduates up to max_count."""
-        unprocessed = df[~df['Nome'].str.strip().isin(existing_names)]
-        
-        if len(unprocessed) == 0:
-            return unprocessed, 0
-        
-        actual_count = min(len(unprocessed), max_count)
-        return unprocessed.head(actual_count), actual_count
-    
-    if choice == '1':
-        df_to_process, actual_count = get_next_unprocessed(recent_df, existing_names, 10)
-        skip_existing = True
-        if actual_count == 0:
-            print("✅ Todos os formandos recentes já foram processados! Nenhum novo usuário para buscar.")
-            return
-        elif actual_count < 10:
-            print(f"📊 Encontrados {actual_count} registros recentes não processados restantes (menos que 10 solicitados)")
-        else:
-            print(f"📊 Encontrados próximos {actual_count} registros recentes não processados para teste rápido")
-    elif choice == '2':
-        df_to_process, actual_count = get_next_unprocessed(recent_df, existing_names, 50)
-        skip_existing = True
-        if actual_count == 0:
-            print("✅ All recent graduates already processed! No new users to search.")
-            return
-        elif actual_count < 50:
-            print(f"📊 Encontrados {actual_count} registros recentes não processados restantes (menos que 50 solicitados)")
-        else:
-            print(f"📊 Encontrados próximos {actual_count} registros recentes não processados para lote pequeno")
-    elif choice == '3':
-        df_to_process, actual_count = get_next_unprocessed(recent_df, existing_names, 200)
-        skip_existing = True
-        if actual_count == 0:
-            print("✅ All recent graduates already processed! No new users to search.")
-            return
-        elif actual_count < 200:
-            print(f"📊 Encontrados {actual_count} registros recentes não processados restantes (menos que 200 solicitados)")
-        else:
-            print(f"📊 Encontrados próximos {actual_count} registros recentes não processados para lote médio")
-    elif choice == '4':
-        df_to_process, actual_count = get_next_unprocessed(recent_df, existing_names, 500)
-        skip_existing = True
-        if actual_count == 0:
-            print("✅ All recent graduates already processed! No new users to search.")
-            return
-        elif actual_count < 500:
-            print(f"📊 Encontrados {actual_count} registros recentes não processados restantes (menos que 500 solicitados)")
-        else:
-            print(f"📊 Encontrados próximos {actual_count} registros recentes não processados para lote grande")
-    elif choice == '5':
-        df_to_process = recent_df
-        skip_existing = True
+    presets = {'1': (10, 'teste rápido'), '2': (50, 'lote pequeno'), '3': (200, 'lote médio'), '4': (500, 'lote grande')}
+    if choice in presets:
+        return presets[choice]
+    if choice == '5':
         print("🚀 MODO PRODUÇÃO ATIVADO (Apenas Formandos Recentes)")
         print("   - Pulará pessoas já encontradas")
         print("   - Processará todos os formandos recentes (2024-2025) eficientemente")
-        print("   - Pode ser interrompido e retomado com segurança")
-    elif choice == '6':
+        print("   - Pode ser interrompido e retomado com segurança (--resume)")
+        return None, 'modo produção'
+    if choice == '6':
         try:
-            count = int(input("Quantos registros recentes não processados buscar: "))
-            df_to_process, actual_count = get_next_unprocessed(recent_df, existing_names, count)
-            skip_existing = True
-            if actual_count == 0:
-                print("✅ All recent graduates already processed! No new users to search.")
-                return
-            elif actual_count < count:
-                print(f"📊 Encontrados {actual_count} registros recentes não processados restantes (menos que {count} solicitados)")
-            else:
-                print(f"📊 Encontrados próximos {actual_count} registros recentes não processados para lote personalizado")
-        except ValueError:
+            return positive(int)(input("Quantos registros recentes não processados buscar: ")), 'lote personalizado'
+        except argparse.ArgumentTypeError:
             print("❌ Número inválido inserido. Usando padrão de 10 registros.")
-            df_to_process, actual_count = get_next_unprocessed(recent_df, existing_names, 10)
-            skip_existing = True
-            if actual_count == 0:
-                print("✅ All recent graduates already processed! No new users to search.")
-                return
+            return 10, 'lote personalizado'
+    return 10, 'teste rápido'
+
+def choose_backend():
+    backend = input(f"Backend de busca ({'/'.join(SEARCH_BACKENDS)}, padrão selenium): ").strip().lower() or 'selenium'
+    if backend not in SEARCH_BACKENDS:
+        print(f"❌ Backend inválido '{backend}'. Usando selenium.")
+        backend = 'selenium'
+    return backend
+
+def choose_workers(backend):
+    max_workers = MAX_ASYNC_CONCURRENCY if backend in HTTP_BACKENDS else MAX_WORKERS
+    try:
+        workers = int(input(f"Workers paralelos (1-{max_workers}, padrão 1): ").strip() or 1)
+    except ValueError:
+        workers = 1
+    return workers
+
+def clamp_workers(backend, workers):
+    # Worker-pool mode: one search session per worker (HTTP uses the asyncio pipeline instead)
+    max_workers = MAX_ASYNC_CONCURRENCY if backend in HTTP_BACKENDS else MAX_WORKERS
+    return max(1, min(workers, max_workers))
+
+def roster_reader(settings, snapshot):
+    """Chunk source for the job's rows: the snapshot's new or changed rows with --changed, None for the whole CSV."""
+    if not settings.get('changed'):
+        return None
+    return lambda chunksize: snapshot.changed_chunks(settings['input_file'], chunksize)
+
+def count_pending(settings, existing_names, cache, snapshot, done_keys=frozenset()):
+    """(is_pending, total_rows, total_recent, remaining_count) for the job's input file."""
+    recent_misses = cache.recent_miss_keys()
+    is_pending = pending_filter(existing_names, recent_misses | set(done_keys), settings.get('shard'))
+    
+    if settings.get('changed'):
+        # Diff the CSV against its last snapshot; rows whose person is already found need no search
+        roster_rows, roster_recent, added, modified, removed = snapshot.refresh(settings['input_file'])
+        snapshot.settle_known(settings['input_file'], existing_names)
+        print(f"🧾 Snapshot do CSV: {added} novos, {modified} alterados, {removed} removidos desde a última execução")
+    
+    # Count rows in a streaming pass; the roster is never held in memory
+    total_rows, total_recent, remaining_count = count_graduates(settings['input_file'], is_pending,
+                                                                read_chunks=roster_reader(settings, snapshot))
+    if settings.get('changed'):
+        print(f"📊 Carregados {roster_rows} registros, {total_rows} novos ou ainda não conferidos")
+        print(f"🎯 Formandos recentes (2024-2025): {total_recent} entre eles, {roster_recent} no total")
+        # The job's figures (progress stats, production summary) are about the whole roster
+        total_rows, total_recent = roster_rows, roster_recent
     else:
-        df_to_process, actual_count = get_next_unprocessed(recent_df, existing_names, 10)
-        skip_existing = True
-        if actual_count == 0:
-            print("✅ All recent graduates already processed! No new users to search.")
-            return
-    
-    # For production mode, still need to filter since we process the full recent dataset
-    if choice == '5' and skip_existing and existing_names:
-        original_count = len(df_to_process)
-        df_to_process = df_to_process[~df_to_process['Nome'].str.strip().isin(existing_names)]
-        skipped_count = original_count - len(df_to_process)
-        
+        print(f"📊 Carregados {total_rows} registros")
+        print(f"🎯 Filtrado para formandos recentes (2024-2025): {total_recent}/{total_rows} registros ({total_recent/max(total_rows, 1)*100:.1f}%)")
+    if recent_misses:
+        print(f"🗄️  Pulando registros buscados recentemente sem resultado ({len(recent_misses)} no cache)")
+    return is_pending, total_rows, total_recent, remaining_count
+
+def print_selection(max_count, label, expected, total_recent, remaining_count):
+    if max_count is None:
         print(f"\n📊 Filtragem do modo produção (Formandos Recentes):")
-        print(f"   📋 Total de formandos recentes: {original_count}")
-        print(f"   ⏭️  Já processados: {skipped_count}")
-        print(f"   🎯 Restantes para processar: {len(df_to_process)}")
-        
-        if len(df_to_process) == 0:
-            print("✅ Todos os formandos recentes já foram processados! Nada a fazer.")
-            return
-    
-    print(f"\n🎯 Processando {len(df_to_process)} registros")
-    
-    # Confirm before large runs
-    if len(df_to_process) > 100:
-        confirm = input(f"⚠️  This will process {len(df_to_process)} records and may take hours. Continue? (y/n): ")
-        if confirm.lower() != 'y':
-            print("Operation cancelled.")
-            return
+        print(f"   📋 Total de formandos recentes: {total_recent}")
+        print(f"   ⏭️  Já processados: {total_recent - remaining_count}")
+        print(f"   🎯 Restantes para processar: {remaining_count}")
+    elif expected < max_count:
+        print(f"📊 Encontrados {expected} registros recentes não processados restantes (menos que {max_count} solicitados)")
+    else:
+        print(f"📊 Encontrados próximos {expected} registros recentes não processados para {label}")
     
-    # Setup driver
-    driver = setup_driver()
-    if not driver:
-        return
+    print(f"\n🎯 Processando {expected} registros")
+
+def process_serial(pending_chunks, expected, existing_names, save, backend, search, store, pacer, deadline=None):
+    """Search pending rows with a single session, in paced batches of 25."""
+    # Setup search session (recycled or replaced by the pool when needed)
+    pool = make_session_pool(backend, 1)
+    if not pool.prewarm():
+        raise RuntimeError("não foi possível iniciar a sessão de busca")
     
     try:
-        # Process in batches
         batch_size = 25
-        total_records = len(df_to_process)
-        total_batches = (total_records + batch_size - 1) // batch_size
+        total_batches = (expected + batch_size - 1) // batch_size
         
         all_results = []
         total_found = 0
         
-        for i in range(0, total_records, batch_size):
-            batch_df = df_to_process.iloc[i:i+batch_size]
-            batch_num = (i // batch_size) + 1
-            
+        for batch_num, batch_df in enumerate(rebatch(pending_chunks, batch_size), 1):
             batch_results, batch_found = process_batch(
-                driver, batch_df, batch_num, total_batches, 
-                existing_names if skip_existing else None
+                pool, batch_df, batch_num, total_batches, existing_names, search, save, pacer
             )
             all_results.extend(batch_results)
             total_found += batch_found
             
-            # Save intermediate results every 5 batches
-            if batch_num % 5 == 0 or batch_num == total_batches:
-                # Update master success file with new finds
-                new_success_records = [r for r in all_results if r['Match Status'] == 'Found' and r['LinkedIn URL']]
-                
-                if new_success_records:
-                    # Reload existing data to get current state with IDs
-                    try:
-                        with open('linkedin_success_master.json', 'r', encoding='utf-8') as f:
-                            current_existing_data = json.load(f)
-                    except:
-                        current_existing_data = existing_data
-                    
-                    total_in_master = update_master_success_file(new_success_records, current_existing_data)
-                    print(f"💾 Arquivo mestre de sucesso atualizado: {total_in_master} perfis totais")
-                else:
-                    print(f"💾 Nenhum novo perfil de sucesso para adicionar ao arquivo mestre")
+            # Every row was already committed as it finished
+            print(f"💾 Arquivo mestre de sucesso: {store.count()} perfis totais")
+            
+            if deadline is not None and time.time() >= deadline:
+                break
             
             # Longer break between batches
             if batch_num < total_batches:
-                print(f"⏳ Taking 30-second break before next batch...")
-                time.sleep(30)
-        
-        # Final results
-        print(f"\n" + "=" * 60)
-        print("🎉 PROCESSAMENTO COMPLETO!")
-        print("=" * 60)
+                pause = pacer.batch_pause()
+                print(f"⏳ Pausa de {pause:.0f}s antes do próximo lote...")
+                with span('pacing'):
+                    time.sleep(pause)
+    finally:
+        print("\n🔧 Fechando sessão de busca...")
+        pool.close()
+    
+    return all_results, total_found
+
+def run_job(job_id, settings, is_pending, expected, store, cache, journal, stats, snapshot, existing_names,
+            deadline=None):
+    """Run one journaled job over the pending rows of its input file.
+    
+    Returns 'completed', or 'timed_out' if the deadline stopped it early (the job
+    stays resumable). Ctrl+C marks the job interrupted and propagates.
+    """
+    backend, workers = settings['backend'], settings['workers']
+    journal.set_status(job_id, 'running')
+    
+    # Rows are streamed from the CSV in chunks as the pipeline consumes them
+    pending_chunks = iter_pending_graduates(settings['input_file'], is_pending, limit=expected,
+                                            read_chunks=roster_reader(settings, snapshot))
+    
+    # Per-graduate search: cached, trying query variants until a conclusive match
+    _, search_query, _ = SEARCH_BACKENDS[backend]
+    planner = QueryPlanner()
+    
+    # AIMD pacing shared by all sessions; the asyncio pipeline uses it as the host's request rate
+    scheduler = None
+    if backend == 'multi':
+        # Each engine keeps its own budget, so the run may go as fast as all of them together
+        scheduler = EngineScheduler(settings.get('engines'))
+        search_query = engine_search(scheduler)
+        pacer = AdaptivePacer(delay=1 / scheduler.total_rate, min_delay=1 / scheduler.total_rate)
+    elif backend == 'http' and workers > 1:
+        pacer = AdaptivePacer(delay=1 / DEFAULT_HOST_RATE)
+    else:
+        pacer = AdaptivePacer()
+    search = cached_search(planned_search(search_query, planner, pacer), cache)
+    
+    def save(result):
+        status, added = save_result(result, store, journal, job_id)
+        if status != 'error':
+            snapshot.settle(settings['input_file'], result)
+        stats.record(status, result.get('Curso', ''), added)
+    
+    # Broad queries per course cohort / surname settle whole groups of rows; leftovers get their own search
+    harvested = []
+    harvester = harvest_pool = None
+    if settings.get('cohorts'):
+        harvest_pool = make_session_pool(backend, 1)
+        harvester = CohortHarvester(search_query, harvest_pool, pacer)
+        
+        def save_match(row, linkedin_url, confidence):
+            result = build_result(row.get('Nome', '').strip(), row.get('Curso', ''), row.get('Faculdade', ''),
+                                  row.get('Data da Colação', ''), linkedin_url, confidence)
+            harvested.append(result)
+            save(result)
+            existing_names.add(result['Nome'], result['Data da Colação'])
+        
+        pending_chunks = harvester.filter_chunks(pending_chunks, save_match, deadline)
+    
+    try:
+        if workers > 1:
+            rows = iter_rows(pending_chunks)
+            if deadline is not None:
+                rows = rows_until(rows, deadline)
+            if backend in HTTP_BACKENDS:
+                all_results, total_found = process_async(rows, expected, existing_names, save, workers,
+                                                         cache=cache, planner=planner, pacer=pacer,
+                                                         query_search=search_query if scheduler else None)
+            else:
+                all_results, total_found = process_parallel(rows, expected, existing_names, save, workers,
+                                                            search, pacer, backend=backend)
+        else:
+            all_results, total_found = process_serial(pending_chunks, expected, existing_names, save, backend,
+                                                      search, store, pacer, deadline)
+    except KeyboardInterrupt:
+        journal.set_status(job_id, 'interrupted')
+        raise
+    finally:
+        if harvest_pool is not None:
+            harvest_pool.close()
+        export_master_file(store)
+        planner.save()
+        stats.finish_job()
+    
+    all_results = harvested + all_results
+    total_found += len(harvested)
+    total_records = len(all_results)
+    timed_out = deadline is not None and total_records < expected and time.time() >= deadline
+    journal.set_status(job_id, 'interrupted' if timed_out else 'completed')
+    
+    print(f"\n" + "=" * 60)
+    print("⏰ JANELA DO JOB ENCERRADA" if timed_out else "🎉 PROCESSAMENTO COMPLETO!")
+    print("=" * 60)
+    if total_records:
         print(f"✅ Total encontrado: {total_found}/{total_records} ({total_found/total_records*100:.1f}%)")
+    print_master_summary(store)
+    if planner.summary():
+        print(planner.summary())
+    if harvester is not None and harvester.summary():
+        print(harvester.summary())
+    print(pacer.summary())
+    if scheduler is not None:
+        print(scheduler.summary())
+    if wait_summary():
+        print(wait_summary())
+    if metrics_summary():
+        print(metrics_summary())
+    return 'timed_out' if timed_out else 'completed'
+
+def window_end(until):
+    """Epoch seconds of the next HH:MM (today, or tomorrow if already past)."""
+    hour, minute = (int(part) for part in until.split(':'))
+    now = datetime.now()
+    end = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if end <= now:
+        end += timedelta(days=1)
+    return end.timestamp()
+
+def run_schedule(args, store, cache, journal, stats, snapshot, existing_names):
+    """Split the unprocessed rows into time-boxed jobs and run them back to back.
+    
+    An unfinished job (interrupted or cut by its time box) is resumed first;
+    otherwise each job takes the next `job_size` pending rows. Stops when the
+    window closes or nothing is left.
+    """
+    end = window_end(args.until) if args.until else None
+    jobs_run = 0
+    
+    while end is None or time.time() < end:
+        unfinished = journal.last_unfinished()
+        if unfinished:
+            job_id, settings = unfinished
+            done_keys = journal.done_keys(job_id)
+        else:
+            job_id, done_keys = None, set()
+            settings = {'input_file': args.input, 'shard': args.shard, 'max_count': args.job_size, 'label': 'job agendado',
+                        'backend': args.backend or 'selenium',
+                        'workers': clamp_workers(args.backend or 'selenium', args.workers or 1), 'cohorts': args.cohorts,
+                        'engines': args.engines, 'changed': args.changed}
+        
+        is_pending, total_rows, total_recent, remaining_count = count_pending(settings, existing_names, cache, snapshot, done_keys)
+        max_count = settings['max_count']
+        if max_count is not None:
+            max_count = max(0, max_count - len(done_keys))
+        expected = remaining_count if max_count is None else min(remaining_count, max_count)
+        if expected == 0:
+            if job_id is not None:
+                journal.set_status(job_id, 'completed')
+                continue
+            print("✅ Nenhum registro pendente - agendador encerrado")
+            break
+        
+        if args.dry_run:
+            jobs = (remaining_count + args.job_size - 1) // args.job_size
+            print(f"🧪 Dry run: {remaining_count} registros pendentes em {jobs} jobs de até {args.job_size} registros "
+                  f"({args.job_minutes} min cada, backend {settings['backend']}, {settings['workers']} workers)")
+            break
+        
+        if job_id is None:
+            job_id = journal.start(settings)
+            print(f"📒 Job agendado #{job_id}: {expected} registros")
+        else:
+            print(f"🔄 Retomando job #{job_id}: {expected} registros restantes")
         
-        # Final update to master success file (no session backup needed)
-        new_success_records = [r for r in all_results if r['Match Status'] == 'Found' and r['LinkedIn URL']]
-        if new_success_records:
-            # Reload existing data to get current state with IDs
-            try:
-                with open('linkedin_success_master.json', 'r', encoding='utf-8') as f:
-                    current_existing_data = json.load(f)
-            except:
-                current_existing_data = existing_data
-            
-            total_in_master = update_master_success_file(new_success_records, current_existing_data)
-            print(f"💾 Arquivo mestre de sucesso atualizado: {total_in_master} perfis únicos totais")
+        deadline = time.time() + args.job_minutes * 60
+        if end is not None:
+            deadline = min(deadline, end)
+        stats.start_job(job_id, expected, total_rows, total_recent, remaining_count, store.count())
+        run_job(job_id, settings, is_pending, expected, store, cache, journal, stats, snapshot, existing_names, deadline)
+        jobs_run += 1
+        
+        # A job that finished no row (e.g. every search errored) would just be retried forever
+        if len(journal.done_keys(job_id)) == len(done_keys):
+            print(f"⚠️  Job #{job_id} não concluiu nenhum registro - agendador encerrado")
+            break
+    
+    print(f"🗓️  Agendador: {jobs_run} jobs executados")
+
+def parse_engines(spec):
+    """'duckduckgo,bing' -> ['duckduckgo', 'bing'] (argparse type for --engines)."""
+    engines = [name.strip().lower() for name in spec.split(',') if name.strip()]
+    unknown = [name for name in engines if name not in SEARCH_ENGINES]
+    if not engines or unknown:
+        raise argparse.ArgumentTypeError(f"buscadores disponíveis: {', '.join(SEARCH_ENGINES)}")
+    return engines
+
+def positive(kind):
+    """argparse type for numbers that must be greater than zero (e.g. positive(int) for --count)."""
+    def parse(text):
+        try:
+            value = kind(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"'{text}' não é um número válido")
+        if not value > 0:
+            raise argparse.ArgumentTypeError(f"'{text}' deve ser maior que zero")
+        return value
+    parse.__name__ = f"positive {kind.__name__}"
+    return parse
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Busca de perfis do LinkedIn para formandos recentes. "
+                    "Sem --count/--all, pergunta as opções interativamente."
+    )
+    parser.add_argument('--input', default='new_graduates.csv', help="CSV de formandos (padrão: new_graduates.csv)")
+    parser.add_argument('--output', help=f"JSON mestre exportado (padrão: {MASTER_FILE})")
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help="busca só a fatia i de N (hash do nome), com store e journal próprios deste nó")
+    parser.add_argument('--merge', nargs='+', metavar='PARCIAL',
+                        help="mescla stores parciais (.db ou .json dos shards) no arquivo mestre e sai")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--count', type=positive(int), help="buscar os próximos N formandos recentes não processados")
+    selection.add_argument('--all', action='store_true', help="buscar todos os formandos recentes não processados")
+    parser.add_argument('--backend', choices=sorted(SEARCH_BACKENDS), help="backend de busca (padrão: selenium)")
+    parser.add_argument('--engines', type=parse_engines, metavar='LISTA',
+                        help=f"buscadores do backend multi, separados por vírgula (padrão: {','.join(SEARCH_ENGINES)})")
+    parser.add_argument('--workers', type=positive(int),
+                        help=f"buscas paralelas (até {MAX_WORKERS} sessões selenium ou {MAX_ASYNC_CONCURRENCY} http)")
+    parser.add_argument('--cohorts', action='store_true',
+                        help="antes das buscas individuais, busca por curso/turma e sobrenome e casa os perfis em lote")
+    parser.add_argument('--changed', action='store_true',
+                        help="busca só formandos novos ou alterados no CSV desde a última execução (roster_snapshot.db)")
+    parser.add_argument('--dry-run', action='store_true', help="mostra o que seria buscado, sem buscar")
+    parser.add_argument('--resume', action='store_true',
+                        help="retoma o último job interrompido exatamente de onde parou")
+    parser.add_argument('--schedule', action='store_true',
+                        help="divide os registros pendentes em jobs com tempo limitado (execução não assistida)")
+    parser.add_argument('--job-size', type=positive(int), default=200, help="registros por job agendado (padrão: 200)")
+    parser.add_argument('--job-minutes', type=positive(float), default=60, help="tempo máximo por job agendado (padrão: 60)")
+    parser.add_argument('--until', help="HH:MM em que o agendador para de iniciar buscas (ex.: 06:00)")
+    return parser.parse_args(argv)
+
+def merge_shards(paths, output):
+    """Merge the shards' partial stores into the master store and export the master JSON."""
+    store = MasterStore(master_file=output)
+    try:
+        added, duplicates = merge_partials(paths, store)
+        print(f"🔀 Mesclados {len(paths)} stores parciais: {added} perfis novos, {duplicates} duplicados ignorados")
+        export_master_file(store)
+    finally:
+        store.close()
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("🚀 Busca de Produção LinkedIn")
+    print("=" * 50)
+    
+    if args.merge:
+        merge_shards(args.merge, args.output or MASTER_FILE)
+        return
+    
+    # A shard node keeps its own partial store, JSON export and journal, seeded from the shared master
+    shard = args.shard
+    if shard:
+        print(f"🧩 Shard {shard[0]}/{shard[1]}")
+    output = args.output or shard_path(MASTER_FILE, shard)
+    
+    # Load existing results to avoid duplicates
+    existing_names, store = load_existing_results(
+        output, shard_path(STORE_FILE, shard), seed_file=MASTER_FILE if shard else None
+    )
+    
+    # Rows searched without a match within the cache TTL are skipped
+    cache = SearchCache()
+    
+    # Every searched row is journaled, so an interrupted job can be resumed
+    journal = JobJournal(shard_path(JOURNAL_FILE, shard))
+    
+    # Running totals for check_progress.py, which reads them instead of rescanning the roster
+    stats = ProgressStats(shard_path(STATS_FILE, shard))
+    
+    # Last-seen state of the roster, so --changed runs only look at rows added or edited since
+    snapshot = RosterSnapshot(shard_path(SNAPSHOT_FILE, shard))
+    
+    # Stage timings: JSONL spans plus a Prometheus snapshot refreshed during the run
+    open_sink(shard_path(METRICS_FILE, shard), shard_path(PROMETHEUS_FILE, shard))
+    
+    try:
+        if args.schedule:
+            run_schedule(args, store, cache, journal, stats, snapshot, existing_names)
+            return
+        
+        job_id, done_keys = None, set()
+        if args.resume:
+            unfinished = journal.last_unfinished()
+            if unfinished is None:
+                print("✅ Nenhum job interrompido para retomar")
+                return
+            job_id, settings = unfinished
+            done_keys = journal.done_keys(job_id)
+            print(f"🔄 Retomando job #{job_id}: {len(done_keys)} registros já concluídos")
         else:
-            print(f"💾 Nenhum novo perfil encontrado nesta sessão")
+            settings = {'input_file': args.input, 'shard': args.shard, 'changed': args.changed}
         
-        # Load and show current master file stats
         try:
-            with open('linkedin_success_master.json', 'r', encoding='utf-8') as f:
-                master_data = json.load(f)
-            
-            print(f"🎯 Arquivo mestre contém {len(master_data)} perfis únicos do LinkedIn")
+            is_pending, total_rows, total_recent, remaining_count = count_pending(
+                settings, existing_names, cache, snapshot, done_keys
+            )
+        except Exception as e:
+            print(f"❌ Error loading CSV: {e}")
+            return
+        
+        interactive = not (args.resume or args.count is not None or args.all)
+        if args.resume:
+            # Resume with the job's own selection and settings; only the rows it has not finished are left
+            max_count, label = settings['max_count'], settings['label']
+            if max_count is not None:
+                max_count = max(0, max_count - len(done_keys))
+        elif interactive:
+            max_count, label = choose_count(remaining_count)
+        else:
+            max_count, label = (None, 'modo produção') if args.all else (args.count, 'lote de linha de comando')
+        
+        expected = remaining_count if max_count is None else min(remaining_count, max_count)
+        if expected == 0:
+            if job_id is not None:
+                print(f"✅ Job #{job_id} já estava completo")
+                journal.set_status(job_id, 'completed')
+            else:
+                print("✅ Todos os formandos recentes já foram processados! Nenhum novo usuário para buscar.")
+            return
+        print_selection(max_count, label, expected, total_recent, remaining_count)
+        
+        if not args.resume:
+            # Confirm before large runs
+            if interactive and expected > 100 and not args.dry_run:
+                confirm = input(f"⚠️  This will process {expected} records and may take hours. Continue? (y/n): ")
+                if confirm.lower() != 'y':
+                    print("Operation cancelled.")
+                    return
             
-            # Show sample of found profiles
-            if master_data:
-                print(f"\n🎯 Amostra do arquivo mestre:")
-                for i, result in enumerate(master_data[-10:], 1):  # Show last 10 added
-                    print(f"   {i:2d}. {result['Nome']:<30} -> {result['LinkedIn URL']}")
-                
-                if len(master_data) > 10:
-                    print(f"   ... total de {len(master_data)} perfis no arquivo mestre")
+            # Search backend: full browser or plain HTTP against the non-JS results page
+            backend = args.backend or (choose_backend() if interactive else 'selenium')
+            workers = args.workers or (choose_workers(backend) if interactive else 1)
+            settings.update(max_count=max_count, label=label, backend=backend,
+                            workers=clamp_workers(backend, workers), cohorts=args.cohorts, engines=args.engines)
+        
+        if args.dry_run:
+            print(f"🧪 Dry run: {expected} registros seriam buscados de {settings['input_file']} "
+                  f"(backend {settings['backend']}, {settings['workers']} workers) - nada foi buscado")
+            return
         
-        except Exception as e:
-            print(f"❌ Error reading master file: {e}")
+        if job_id is None:
+            job_id = journal.start(settings)
+            print(f"📒 Job #{job_id} iniciado (retome com --resume se for interrompido)")
+        
+        stats.start_job(job_id, expected, total_rows, total_recent, remaining_count, store.count())
+        run_job(job_id, settings, is_pending, expected, store, cache, journal, stats, snapshot, existing_names)
     
     except KeyboardInterrupt:
         print(f"\n⚠️  Processo interrompido pelo usuário")
-        # Save partial results to master file only
-        if 'all_results' in locals() and all_results:
-            new_success_records = [r for r in all_results if r['Match Status'] == 'Found' and r['LinkedIn URL']]
-            
-            if new_success_records:
-                total_in_master = update_master_success_file(new_success_records, existing_data)
-                print(f"💾 Progresso salvo no arquivo mestre: {total_in_master} perfis totais")
-            else:
-                print(f"💾 Nenhum novo perfil encontrado antes da interrupção")
-            
-            print("🔄 Você pode retomar executando o script novamente - ele pulará o trabalho concluído")
+        # Every finished row is already committed to the master store and the job journal
+        print(f"💾 Progresso salvo no arquivo mestre: {store.count()} perfis totais")
+        print("🔄 Retome com --resume - ele continuará exatamente de onde parou")
     
     except Exception as e:
         print(f"❌ Erro durante o processamento: {e}")
     
     finally:
-        print("\n🔧 Fechando navegador...")
-        driver.quit()
+        cache.close()
+        store.close()
+        journal.close()
+        snapshot.close()
+        close_sink()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
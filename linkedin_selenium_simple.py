@@ -8,7 +8,8 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from page_wait import wait_for_results, wait_summary
+from search_backends import DDG_URL, extract_linkedin_candidates_in_browser
 import re
 import os
 
@@ -51,7 +52,7 @@ def test_basic_navigation(driver):
     """Test basic browser navigation."""
     try:
         print("🧪 Testing basic navigation...")
-        driver.get("https://www.google.com")
+        driver.get(DDG_URL)
         
         # Wait for page to load
         WebDriverWait(driver, 10).until(
@@ -72,7 +73,7 @@ def search_duckduckgo_simple(driver, query):
         print(f"🔍 Searching DuckDuckGo for: {query}")
         
         # Navigate to DuckDuckGo
-        driver.get("https://duckduckgo.com")
+        driver.get(DDG_URL)
         
         # Wait for search box
         search_box = WebDriverWait(driver, 10).until(
@@ -84,37 +85,11 @@ def search_duckduckgo_simple(driver, query):
         search_box.send_keys(query)
         search_box.submit()
         
-        # Wait for results
-        time.sleep(3)
-        
-        # Get page source
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        # Look for LinkedIn URLs
-        linkedin_urls = []
-        
-        # Search in all links
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if 'linkedin.com/in/' in href:
-                # Clean DuckDuckGo redirect URLs
-                if '/l/?uddg=' in href:
-                    try:
-                        import urllib.parse
-                        actual_url = urllib.parse.unquote(href.split('uddg=')[1])
-                        if actual_url.startswith('http'):
-                            linkedin_urls.append(actual_url)
-                    except:
-                        pass
-                elif href.startswith('http'):
-                    linkedin_urls.append(href)
-        
-        # Clean URLs
-        clean_urls = []
-        for url in linkedin_urls:
-            clean_url = url.split('?')[0].split('#')[0]
-            if clean_url not in clean_urls and 'linkedin.com/in/' in clean_url:
-                clean_urls.append(clean_url)
+        # Wait until results render (bounded), instead of a fixed sleep
+        wait_for_results(driver)
+        
+        # Extract and clean LinkedIn URLs
+        clean_urls = [candidate['url'] for candidate in extract_linkedin_candidates_in_browser(driver)]
         
         print(f"   Found {len(clean_urls)} LinkedIn URLs")
         return clean_urls[:3]
@@ -149,6 +124,7 @@ def main():
                 print(f"   {i}. {url}")
         else:
             print("❌ No results found in test search")
+        print(wait_summary())
         
         # Ask if user wants to continue with CSV processing
         if results:
@@ -0,0 +1,166 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from profile_urls import canonical_profile_url, profile_key
+
+STORE_FILE = 'linkedin_success_master.db'
+MASTER_FILE = 'linkedin_success_master.json'
+
+# Record fields, in the order they appear in the exported master JSON
+FIELDS = ['id', 'Nome', 'Curso', 'Faculdade', 'Data da Colação', 'LinkedIn URL', 'Confidence', 'Last Updated']
+COLUMNS = ['id', 'nome', 'curso', 'faculdade', 'data_colacao', 'linkedin_url', 'confidence', 'last_updated']
+
+class MasterStore:
+    """Append-only SQLite store of found profiles, indexed on URL, canonical profile key, name and id.
+
+    Every append is its own committed transaction, so a crash never loses a
+    find that was reported as saved. A profile is stored once, under its
+    canonical URL, whatever URL it was found under (regional host, trailing
+    slash, slug case; see profile_urls). export_json() writes the classic
+    linkedin_success_master.json shape.
+    """
+
+    def __init__(self, path=STORE_FILE, master_file=MASTER_FILE):
+        self.path = path
+        self.master_file = master_file
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                nome TEXT NOT NULL,
+                curso TEXT,
+                faculdade TEXT,
+                data_colacao TEXT,
+                linkedin_url TEXT NOT NULL UNIQUE,
+                confidence REAL,
+                last_updated TEXT,
+                profile_key TEXT
+            )
+        """)
+        # Stores created before match confidence was recorded
+        existing_columns = {row[1] for row in self.conn.execute("PRAGMA table_info(profiles)")}
+        if 'confidence' not in existing_columns:
+            self.conn.execute("ALTER TABLE profiles ADD COLUMN confidence REAL")
+        # Stores created before profile URLs were canonicalized
+        if 'profile_key' not in existing_columns:
+            self.conn.execute("ALTER TABLE profiles ADD COLUMN profile_key TEXT")
+            self._key_existing_profiles()
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_profiles_key ON profiles (profile_key)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_nome ON profiles (nome)")
+        self.conn.commit()
+
+        # First run on top of an existing master JSON: import it once
+        if self.count() == 0 and os.path.exists(master_file):
+            self.import_json(master_file)
+
+    def _key_existing_profiles(self):
+        """Key and canonicalize the URLs of existing records; later copies of an already stored profile are dropped."""
+        seen = set()
+        duplicates = []
+        updates = []
+        for seq, linkedin_url in self.conn.execute("SELECT seq, linkedin_url FROM profiles ORDER BY seq").fetchall():
+            key = profile_key(linkedin_url)
+            if key is not None and key in seen:
+                duplicates.append((seq,))
+                continue
+            seen.add(key)
+            updates.append((key, canonical_profile_url(linkedin_url) or linkedin_url, seq))
+        # Duplicates go first: one of them may already hold the canonical URL (linkedin_url is UNIQUE)
+        self.conn.executemany("DELETE FROM profiles WHERE seq = ?", duplicates)
+        self.conn.executemany("UPDATE profiles SET profile_key = ?, linkedin_url = ? WHERE seq = ?", updates)
+        if duplicates:
+            print(f"🔗 {len(duplicates)} perfis repetidos (mesmo perfil com outra URL) removidos de {self.path}")
+
+    def import_json(self, path):
+        """Load records from a master JSON file, keeping their ids."""
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        for record in records:
+            self.add(record, commit=False)
+        with self._lock:
+            self.conn.commit()
+        return len(records)
+
+    def new_id(self):
+        """Generate a unique 8-character ID that isn't in the store."""
+        while True:
+            new_id = str(uuid.uuid4())[:8]
+            if not self.has_id(new_id):
+                return new_id
+
+    def add(self, record, commit=True):
+        """Append a record, assigning an id if needed. Returns False if its profile is already stored."""
+        linkedin_url = record.get('LinkedIn URL', '')
+        if not linkedin_url:
+            return False
+        record = dict(record, **{'LinkedIn URL': canonical_profile_url(linkedin_url) or linkedin_url})
+        values = [record.get('id') or self.new_id()] + [record.get(field) for field in FIELDS[1:]]
+        values.append(profile_key(linkedin_url))
+        with self._lock:
+            cursor = self.conn.execute(
+                f"INSERT OR IGNORE INTO profiles ({', '.join(COLUMNS)}, profile_key) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                values
+            )
+            if commit:
+                self.conn.commit()
+        return cursor.rowcount == 1
+
+    def remove(self, ids):
+        """Delete records by id."""
+        with self._lock:
+            self.conn.executemany("DELETE FROM profiles WHERE id = ?", [(i,) for i in ids])
+            self.conn.commit()
+
+    def _exists(self, column, value):
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT 1 FROM profiles WHERE {column} = ? LIMIT 1", (value,)
+            ).fetchone() is not None
+
+    def has_url(self, linkedin_url):
+        """Whether the profile is stored, under this URL or any other spelling of it."""
+        key = profile_key(linkedin_url)
+        if key is None:
+            return self._exists('linkedin_url', linkedin_url)
+        return self._exists('profile_key', key)
+
+    def has_id(self, record_id):
+        return self._exists('id', record_id)
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def records(self, last=None):
+        """All records in insertion order, or only the `last` N."""
+        columns = ', '.join(COLUMNS)
+        with self._lock:
+            if last is None:
+                rows = self.conn.execute(f"SELECT {columns} FROM profiles ORDER BY seq").fetchall()
+            else:
+                rows = self.conn.execute(
+                    f"SELECT {columns} FROM profiles ORDER BY seq DESC LIMIT ?", (last,)
+                ).fetchall()[::-1]
+        return [dict(zip(FIELDS, row)) for row in rows]
+
+    def export_json(self, path=None):
+        """Write the master JSON atomically (temp file + rename). Returns the record count."""
+        path = path or self.master_file
+        records = self.records()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return len(records)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,103 @@
+import urllib.parse
+from names import fold_text, name_tokens, text_tokens
+
+# Below this confidence the best candidate is not accepted as the graduate's profile
+MIN_CONFIDENCE = 0.5
+
+# A candidate's name score must exceed this to be accepted: the first name
+# alone scores 0.5, so at least one surname has to match as well
+MIN_NAME_SCORE = 0.5
+
+# Share of the confidence that comes from the name; the rest from university and course
+NAME_WEIGHT = 0.8
+UNIVERSITY_WEIGHT = 0.1
+COURSE_WEIGHT = 0.1
+
+def profile_slug(url):
+    """Folded profile slug of a LinkedIn URL ('maria-silva-1a2b' -> 'maria silva 1a2b')."""
+    path = urllib.parse.urlparse(url).path
+    slug = path.split('/in/', 1)[-1].strip('/').split('/')[0]
+    return fold_text(urllib.parse.unquote(slug).replace('-', ' ').replace('_', ' '))
+
+def concatenated_name_tokens(tokens, slug):
+    """Name tokens spelled out by a slug written as one word ('juliayahagi-1a2b'), else an empty set.
+
+    The word must be exactly the first name followed by some of the surnames,
+    in order, so 'mariana' never matches 'ana' or 'maria'.
+    """
+    words = [word for word in slug.split() if not any(c.isdigit() for c in word)]
+    if len(words) != 1 or not tokens or not words[0].startswith(tokens[0]):
+        return set()
+    word = words[0]
+    position = len(tokens[0])
+    hits = {tokens[0]}
+    for token in tokens[1:]:
+        if word.startswith(token, position):
+            hits.add(token)
+            position += len(token)
+    return hits if position == len(word) else set()
+
+def name_score(tokens, slug, text_token_set):
+    """How well the name shows up in the slug or the result text, in [0, 1].
+
+    Half comes from the first name, half from the surnames: profiles usually
+    carry only one or two of a Brazilian graduate's surnames, so two matching
+    surnames already count as complete. Tokens are matched whole; a slug
+    written as one word is matched as the names concatenated
+    (see concatenated_name_tokens).
+    """
+    if not tokens:
+        return 0.0
+    slug_tokens = set(slug.split())
+    concatenated = concatenated_name_tokens(tokens, slug)
+
+    def found(token):
+        return token in slug_tokens or token in text_token_set or token in concatenated
+
+    first, surnames = tokens[0], tokens[1:]
+    if not surnames:
+        return 1.0 if found(first) else 0.0
+    surname_hits = sum(1 for token in surnames if found(token))
+    return 0.5 * found(first) + 0.5 * min(1.0, surname_hits / min(2, len(surnames)))
+
+def candidate_name_score(candidate, name):
+    """name_score of a candidate ({'url', 'text'}) against the graduate's name."""
+    return name_score(name_tokens(name), profile_slug(candidate['url']),
+                      set(text_tokens(candidate.get('text', ''))))
+
+def score_candidate(candidate, name, course='', university=''):
+    """Confidence in [0, 1] that a candidate ({'url', 'text'}) is the graduate's profile."""
+    text_token_set = set(text_tokens(candidate.get('text', '')))
+    score = NAME_WEIGHT * candidate_name_score(candidate, name)
+
+    university_tokens = set(text_tokens(university))
+    if university_tokens and university_tokens <= text_token_set:
+        score += UNIVERSITY_WEIGHT
+
+    course_tokens = set(name_tokens(course))
+    if course_tokens:
+        score += COURSE_WEIGHT * len(course_tokens & text_token_set) / len(course_tokens)
+
+    return round(min(score, 1.0), 3)
+
+def rank_candidates(candidates, name, course='', university=''):
+    """Candidates with their confidence, best first (ties keep page order)."""
+    scored = [(score_candidate(c, name, course, university), c) for c in candidates]
+    return sorted(scored, key=lambda pair: -pair[0])
+
+def best_match(candidates, name, course='', university='', min_confidence=MIN_CONFIDENCE):
+    """(url, confidence) of the best candidate, or (None, best confidence) if none is good enough.
+
+    Besides reaching `min_confidence`, the candidate must match a surname
+    (MIN_NAME_SCORE): a shared first name plus course and university is
+    somebody else from the same class.
+    """
+    ranked = rank_candidates(candidates or [], name, course, university)
+    if not ranked:
+        return None, 0.0
+    for confidence, candidate in ranked:
+        if confidence < min_confidence:
+            break
+        if candidate_name_score(candidate, name) > MIN_NAME_SCORE:
+            return candidate['url'], confidence
+    return None, ranked[0][0]
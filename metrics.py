@@ -0,0 +1,178 @@
+import contextlib
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+
+METRICS_FILE = 'metrics.jsonl'
+PROMETHEUS_FILE = 'metrics.prom'
+
+# The Prometheus snapshot is rewritten at most this often while spans come in
+SNAPSHOT_INTERVAL = 30
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Samples kept per span name for the quantiles; counts and sums still cover every span
+RESERVOIR_SIZE = 2048
+
+# Waits that are not work: time in these spans is left out of the spans around them
+PACING_SPANS = ('pacing',)
+
+# Spans open in the current context, innermost last; each entry holds its seconds spent pacing
+_open_spans = contextvars.ContextVar('open_spans', default=())
+
+class Reservoir:
+    """Uniform sample of at most `size` values (reservoir sampling) with the exact count, sum and max.
+
+    Memory stays bounded however long the run; quantiles come from the sample.
+    """
+
+    def __init__(self, size=RESERVOIR_SIZE):
+        self.size = size
+        self.samples = []
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, value):
+        with self._lock:
+            self.count += 1
+            self.total += value
+            self.maximum = max(self.maximum, value)
+            if len(self.samples) < self.size:
+                self.samples.append(value)
+            else:
+                slot = random.randrange(self.count)
+                if slot < self.size:
+                    self.samples[slot] = value
+
+    def quantiles(self, qs=QUANTILES):
+        """Estimated value at each quantile in `qs` (0.0 for each if empty)."""
+        with self._lock:
+            values = sorted(self.samples)
+        return tuple(percentile(values, q) if values else 0.0 for q in qs)
+
+# Span durations in seconds, per span name, for the whole process
+durations = defaultdict(Reservoir)
+
+_lock = threading.Lock()
+_snapshot_lock = threading.Lock()
+_sink = None
+_prom_path = None
+_started = None
+_last_snapshot = 0.0
+
+def open_sink(path=METRICS_FILE, prom_path=PROMETHEUS_FILE):
+    """Start appending spans to a JSONL file and keeping a Prometheus text snapshot."""
+    global _sink, _prom_path
+    with _lock:
+        _sink = open(path, 'a', encoding='utf-8')
+        _prom_path = prom_path
+
+def close_sink():
+    """Write a final snapshot and close the JSONL file."""
+    global _sink
+    write_snapshot()
+    with _lock:
+        if _sink is not None:
+            _sink.close()
+            _sink = None
+
+def record(name, seconds, **labels):
+    """Record one span; labels (tier, backend, ...) only go to the JSONL line."""
+    global _started, _last_snapshot
+    now = time.time()
+    with _lock:
+        if _started is None:
+            _started = now - seconds
+        durations[name].add(seconds)
+        if _sink is not None:
+            _sink.write(json.dumps({'ts': round(now, 3), 'span': name, 'seconds': round(seconds, 4), **labels}) + '\n')
+        snapshot_due = _prom_path is not None and now - _last_snapshot >= SNAPSHOT_INTERVAL
+        if snapshot_due:
+            _last_snapshot = now
+    if snapshot_due:
+        write_snapshot()
+
+@contextlib.contextmanager
+def span(name, **labels):
+    """`with span('fetch'):` times the block and records it, even if it raises.
+
+    Pacing spans nested inside (e.g. a search waiting for its engine's slot
+    within a 'query' span) are not counted in the outer span's duration.
+    """
+    paced = [0.0]
+    token = _open_spans.set(_open_spans.get() + (paced,))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _open_spans.reset(token)
+        if name in PACING_SPANS:
+            for outer in _open_spans.get():
+                outer[0] += seconds
+        record(name, max(0.0, seconds - paced[0]), **labels)
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+def queries_per_minute():
+    """Queries ('query' spans) per minute since the first span."""
+    with _lock:
+        queries = durations['query'].count if 'query' in durations else 0
+        elapsed = time.time() - _started if _started is not None else 0
+    return queries / (elapsed / 60) if elapsed > 0 else 0.0
+
+def prometheus_text():
+    """Span latency quantiles and query throughput in the Prometheus text format."""
+    with _lock:
+        spans = {name: values for name, values in durations.items() if values.count}
+    lines = [
+        '# HELP linkedin_search_span_seconds Latency of each pipeline stage.',
+        '# TYPE linkedin_search_span_seconds summary',
+    ]
+    for name, values in sorted(spans.items()):
+        for q, value in zip(QUANTILES, values.quantiles()):
+            lines.append(f'linkedin_search_span_seconds{{span="{name}",quantile="{q}"}} {value:.4f}')
+        lines.append(f'linkedin_search_span_seconds_sum{{span="{name}"}} {values.total:.4f}')
+        lines.append(f'linkedin_search_span_seconds_count{{span="{name}"}} {values.count}')
+    lines += [
+        '# HELP linkedin_search_queries_per_minute Search queries per minute since the run started.',
+        '# TYPE linkedin_search_queries_per_minute gauge',
+        f'linkedin_search_queries_per_minute {queries_per_minute():.2f}',
+    ]
+    return '\n'.join(lines) + '\n'
+
+def write_snapshot():
+    """Rewrite the Prometheus snapshot atomically (no-op until open_sink())."""
+    global _last_snapshot
+    with _lock:
+        path = _prom_path
+        _last_snapshot = time.time()
+        if _sink is not None:
+            _sink.flush()
+    if path is None:
+        return
+    with _snapshot_lock:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(prometheus_text())
+        os.replace(tmp_path, path)
+
+def metrics_summary():
+    """One line per span with p50/p95/p99, or '' if nothing was recorded."""
+    with _lock:
+        spans = {name: values for name, values in durations.items() if values.count}
+    if not spans:
+        return ''
+    lines = ["📈 Latência por etapa (p50 / p95 / p99):"]
+    for name, values in sorted(spans.items()):
+        p50, p95, p99 = values.quantiles()
+        lines.append(f"   {name:<10} {p50:6.2f}s / {p95:6.2f}s / {p99:6.2f}s  ({values.count}x)")
+    lines.append(f"   {queries_per_minute():.1f} consultas/min")
+    return '\n'.join(lines)
@@ -0,0 +1,316 @@
+import argparse
+import csv
+import glob
+import html
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Query prefixes the query planner puts before the name (see query_planner.TIERS)
+QUERY_PREFIX_RE = re.compile(r'^(?:linkedin|site:linkedin\.com/in)\s+', re.IGNORECASE)
+
+# Search form of the JS results page; the selenium backend types into `q` and submits it
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><title>DuckDuckGo</title></head>
+<body>
+<form id="search_form_homepage" action="/html/" method="get">
+  <input id="search_form_input_homepage" type="text" name="q" autocomplete="off">
+  <input type="submit" value="S">
+</form>
+</body></html>
+"""
+
+# Same markup as the non-JS results page (html.duckduckgo.com/html/), with redirect-wrapped links
+RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><title>{query} at DuckDuckGo</title></head>
+<body>
+<div id="links" class="results">
+{results}
+</div>
+</body></html>
+"""
+
+RESULT_BLOCK = """<div class="result results_links results_links_deep web-result">
+  <div class="links_main links_deep result__body">
+    <h2 class="result__title">
+      <a rel="nofollow" class="result__a" href="//duckduckgo.com/l/?uddg={target}&amp;rut=mock">{title}</a>
+    </h2>
+    <a class="result__url" href="//duckduckgo.com/l/?uddg={target}&amp;rut=mock">{display_url}</a>
+    <a class="result__snippet" href="//duckduckgo.com/l/?uddg={target}&amp;rut=mock">{snippet}</a>
+  </div>
+</div>"""
+
+NO_RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><title>{query} at DuckDuckGo</title></head>
+<body>
+<div id="links" class="results">
+  <div class="no-results" data-testid="no-results">No results found for <b>{query}</b>.</div>
+</div>
+</body></html>
+"""
+
+# The challenge page DuckDuckGo serves (with status 200) once it decides we are a bot
+BLOCK_PAGE = """<!DOCTYPE html>
+<html><head><title>DuckDuckGo</title></head>
+<body>
+<div class="anomaly-modal__title">Unfortunately, bots use DuckDuckGo too.</div>
+<div class="anomaly-modal__description">Please complete the following challenge to confirm this search was made by a human.</div>
+<div class="anomaly-modal__instructions">Select all squares containing a duck:</div>
+</body></html>
+"""
+
+def slugify(text):
+    """'João da Silva' -> 'joao-da-silva', like a LinkedIn vanity URL."""
+    ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return '-'.join(re.findall(r'[a-z0-9]+', ascii_text.lower()))
+
+def name_from_query(query):
+    """The searched words without the planner's 'linkedin' / 'site:' prefix."""
+    return QUERY_PREFIX_RE.sub('', query.strip()).strip()
+
+def results_page(query, rng, extra_results=3):
+    """A results page for `query` whose first hit is a LinkedIn profile named after it."""
+    words = name_from_query(query)
+    slug = slugify(words) or 'perfil'
+    profile = f"https://br.linkedin.com/in/{slug}-{rng.randrange(16 ** 6):06x}"
+    blocks = [RESULT_BLOCK.format(
+        target=urllib.parse.quote(profile, safe=''),
+        title=html.escape(f"{words} - LinkedIn"),
+        display_url=html.escape(profile.split('://')[1]),
+        snippet=html.escape(f"Veja o perfil de {words} no LinkedIn, a maior comunidade profissional do mundo."),
+    )]
+    for i in range(extra_results):
+        target = f"https://www.example.com/{slug}/{i}"
+        blocks.append(RESULT_BLOCK.format(
+            target=urllib.parse.quote(target, safe=''),
+            title=html.escape(f"{words} | resultado {i + 1}"),
+            display_url=html.escape(target.split('://')[1]),
+            snippet=html.escape(f"Página sem relação com o LinkedIn para {words}."),
+        ))
+    return RESULTS_PAGE.format(query=html.escape(query), results='\n'.join(blocks))
+
+# Results per page, like the non-JS results page
+PAGE_SIZE = 30
+
+def profile_url(person):
+    """Stable LinkedIn URL of a roster person."""
+    slug = slugify(person.get('Nome', '')) or 'perfil'
+    return f"https://br.linkedin.com/in/{slug}-{zlib.crc32(slug.encode('utf-8')) % 16 ** 6:06x}"
+
+def person_words(person):
+    """Slug words of a roster row's name, course, university and graduation date."""
+    return set(slugify(' '.join(str(value) for value in person.values())).split('-'))
+
+def roster_matches(query, roster, limit=PAGE_SIZE):
+    """People of an indexed roster ([(words, person)]) matching every word of the query."""
+    words = slugify(name_from_query(query)).split('-')
+    matches = []
+    for person_word_set, person in roster:
+        if all(word in person_word_set for word in words):
+            matches.append(person)
+            if len(matches) == limit:
+                break
+    return matches
+
+def roster_page(query, people):
+    """A results page listing the profiles of `people`, as a broad or a name query would."""
+    blocks = []
+    for person in people:
+        url = profile_url(person)
+        blocks.append(RESULT_BLOCK.format(
+            target=urllib.parse.quote(url, safe=''),
+            title=html.escape(f"{person.get('Nome', '')} - {person.get('Faculdade', '')} | LinkedIn"),
+            display_url=html.escape(url.split('://')[1]),
+            snippet=html.escape(f"{person.get('Curso', '')} · {person.get('Faculdade', '')}. "
+                                f"Veja o perfil de {person.get('Nome', '')} no LinkedIn."),
+        ))
+    return RESULTS_PAGE.format(query=html.escape(query), results='\n'.join(blocks))
+
+def load_roster(path):
+    """Roster rows (dicts) from a graduates CSV, for roster-aware results."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return [row for row in csv.DictReader(f) if (row.get('Nome') or '').strip()]
+
+def load_recorded_pages(pages_dir):
+    """Recorded result pages (*.html) from a directory, served verbatim instead of the generated ones."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    if not pages:
+        raise ValueError(f"nenhuma página .html em {pages_dir}")
+    return pages
+
+class MockSearchServer:
+    """Local stand-in for DuckDuckGo with configurable latency, errors and block pages.
+
+    Serves the search form at / and results at /html/ (GET or POST, like the
+    real non-JS endpoint) and at /search, the path of the other engines. Each request sleeps `latency` seconds (± `jitter`),
+    then fails with HTTP 500 with probability `error_rate`, gets a challenge
+    page with probability `block_rate` (with `block_status`, 200 like the real
+    host or e.g. 429), or no results with probability `miss_rate`. Everything
+    else gets one of the recorded `pages` or, with a `roster`, the profiles of
+    every roster person matching the query (so broad course queries list a
+    whole cohort); otherwise a page generated from the query words.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0, block_rate=0.0,
+                 miss_rate=0.0, block_status=200, pages=None, seed=None, roster=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.block_rate = block_rate
+        self.miss_rate = miss_rate
+        self.block_status = block_status
+        self.pages = pages
+        self.roster = [(person_words(person), person) for person in roster or ()]
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {}
+        self.reset_counts()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def html_url(self):
+        return f"{self.url}/html/"
+
+    @property
+    def search_url(self):
+        return f"{self.url}/search"
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts = {'requests': 0, 'results': 0, 'empty': 0, 'errors': 0, 'blocks': 0}
+
+    def _count(self, kind):
+        with self._lock:
+            self.counts['requests'] += 1
+            self.counts[kind] += 1
+
+    def respond(self, query):
+        """(status, page) for one results request, after the configured latency."""
+        with self._lock:
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            draw = self._rng.random()
+            page_rng = random.Random(self._rng.random())
+        time.sleep(delay)
+        if draw < self.error_rate:
+            self._count('errors')
+            return 500, "<html><body>Internal Server Error</body></html>"
+        draw -= self.error_rate
+        if draw < self.block_rate:
+            self._count('blocks')
+            return self.block_status, BLOCK_PAGE
+        draw -= self.block_rate
+        if draw < self.miss_rate or not query.strip():
+            self._count('empty')
+            return 200, NO_RESULTS_PAGE.format(query=html.escape(query))
+        self._count('results')
+        if self.pages:
+            return 200, page_rng.choice(self.pages)
+        people = roster_matches(query, self.roster) if self.roster else []
+        if people:
+            return 200, roster_page(query, people)
+        return 200, results_page(query, page_rng)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _send(self, status, page):
+                body = page.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _search(self, params):
+                query = (params.get('q') or [''])[0]
+                self._send(*server.respond(query))
+
+            def do_GET(self):
+                parsed = urllib.parse.urlsplit(self.path)
+                if parsed.path.rstrip('/') in ('/html', '/search'):
+                    self._search(urllib.parse.parse_qs(parsed.query))
+                elif parsed.path == '/':
+                    self._send(200, HOME_PAGE)
+                else:
+                    self._send(404, "<html><body>Not Found</body></html>")
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode('utf-8', 'replace')
+                if urllib.parse.urlsplit(self.path).path.rstrip('/') in ('/html', '/search'):
+                    self._search(urllib.parse.parse_qs(body))
+                else:
+                    self._send(404, "<html><body>Not Found</body></html>")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Serve from a background thread; returns self."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que imita o DuckDuckGo para testes e benchmarks.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.3, help="segundos por resposta (padrão: 0.3)")
+    parser.add_argument('--jitter', type=float, default=0.1, help="variação da latência, em segundos")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fração de respostas HTTP 500")
+    parser.add_argument('--block-rate', type=float, default=0.0, help="fração de páginas de desafio")
+    parser.add_argument('--block-status', type=int, default=200, help="status das páginas de desafio (ex.: 429)")
+    parser.add_argument('--miss-rate', type=float, default=0.0, help="fração de páginas sem resultados")
+    parser.add_argument('--pages', help="diretório com páginas de resultado gravadas (*.html)")
+    parser.add_argument('--roster', help="CSV de formandos: as buscas listam os perfis dos formandos correspondentes")
+    parser.add_argument('--seed', type=int)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = MockSearchServer(
+        args.host, args.port, args.latency, args.jitter, args.error_rate, args.block_rate, args.miss_rate,
+        args.block_status, load_recorded_pages(args.pages) if args.pages else None, args.seed,
+        load_roster(args.roster) if args.roster else None
+    )
+    print(f"🦆 Mock do DuckDuckGo em {server.url}")
+    print("   Aponte o pipeline para ele com:")
+    print(f"   DDG_URL={server.url} DDG_HTML_URL={server.html_url} python linkedin_production.py ...")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 Respostas: {server.counts}")
+
+if __name__ == "__main__":
+    main()
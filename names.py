@@ -0,0 +1,56 @@
+import hashlib
+import re
+import unicodedata
+
+# Portuguese name particles, ignored when matching names
+PARTICLES = {'de', 'da', 'do', 'das', 'dos', 'e', 'di', 'del', 'della', 'van', 'von'}
+
+def fold_text(text):
+    """Accent-fold, casefold and collapse whitespace."""
+    text = unicodedata.normalize('NFKD', text if isinstance(text, str) else '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.casefold().split())
+
+def text_tokens(text):
+    """Folded alphanumeric tokens of a text."""
+    return re.findall(r'[a-z0-9]+', fold_text(text))
+
+def name_tokens(name):
+    """Folded name tokens without particles ("da", "dos", ...)."""
+    return [token for token in text_tokens(name) if token not in PARTICLES]
+
+def name_key(name):
+    """Folded, particle-free name: 'João  da Silva' and 'joao silva' give 'joao silva'."""
+    return ' '.join(name_tokens(name))
+
+def person_key(name, graduation_date=''):
+    """Stable 64-bit key of a graduate: the name key plus the graduation date's digits.
+
+    The date separates homonyms; the hash keeps the key the same size
+    whatever the name length, and the same on every host.
+    """
+    date_digits = re.sub(r'\D', '', graduation_date if isinstance(graduation_date, str) else '')
+    digest = hashlib.blake2b(f"{name_key(name)}|{date_digits}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+class NameIndex:
+    """Set of person keys: O(1) membership at a fraction of the memory of the raw names."""
+
+    def __init__(self, people=()):
+        self.keys = set()
+        for name, graduation_date in people:
+            self.add(name, graduation_date)
+
+    def add(self, name, graduation_date=''):
+        self.keys.add(person_key(name, graduation_date))
+
+    def contains(self, name, graduation_date=''):
+        return person_key(name, graduation_date) in self.keys
+
+    def contains_many(self, names, graduation_dates):
+        """Membership of each (name, date) pair, in order."""
+        keys = self.keys
+        return [person_key(n, d) in keys for n, d in zip(names, graduation_dates)]
+
+    def __len__(self):
+        return len(self.keys)
@@ -0,0 +1,51 @@
+import time
+from metrics import Reservoir
+
+# Containers DuckDuckGo renders for results (or for an empty result set)
+RESULT_SELECTORS = "[data-testid='result'], #links .result, .results--main article, [data-testid='no-results']"
+
+RESULTS_TIMEOUT = 10    # upper bound on the wait, in seconds
+POLL_INTERVAL = 0.1
+STABLE_POLLS = 3        # unchanged DOM size for this many polls counts as loaded
+
+# Seconds actually spent waiting, sampled per search (bounded, see metrics.Reservoir)
+wait_times = Reservoir()
+
+def wait_for_results(driver, timeout=RESULTS_TIMEOUT, url_contains='q='):
+    """Return as soon as the results container is present or the results page DOM stops changing.
+
+    Records and returns the time spent waiting, capped at `timeout`.
+    """
+    from selenium.webdriver.common.by import By
+    start = time.monotonic()
+    last_size = None
+    stable = 0
+
+    while time.monotonic() - start < timeout:
+        try:
+            if driver.find_elements(By.CSS_SELECTOR, RESULT_SELECTORS):
+                break
+
+            # Only judge stability once the browser has left the search form page
+            if url_contains in driver.current_url:
+                size = driver.execute_script("return document.getElementsByTagName('*').length")
+                stable = stable + 1 if size == last_size else 0
+                last_size = size
+                if stable >= STABLE_POLLS:
+                    break
+        except Exception:
+            pass
+        time.sleep(POLL_INTERVAL)
+
+    elapsed = time.monotonic() - start
+    wait_times.add(elapsed)
+    return elapsed
+
+def wait_summary():
+    """Short summary of the recorded waits, or '' if none."""
+    if not wait_times.count:
+        return ''
+    mean = wait_times.total / wait_times.count
+    p95, = wait_times.quantiles((0.95,))
+    return (f"⏱️  Espera por resultados: média {mean:.2f}s, p95 {p95:.2f}s, máx {wait_times.maximum:.2f}s "
+            f"({wait_times.count} buscas)")
@@ -0,0 +1,41 @@
+import re
+import unicodedata
+import urllib.parse
+
+# Host of the canonical profile URL; regional hosts (br., pt., ...) and the bare domain serve the same profiles
+CANONICAL_HOST = 'www.linkedin.com'
+
+LINKEDIN_HOST_RE = re.compile(r'(?:^|\.)linkedin\.com$')
+
+def profile_key(url):
+    """Canonical key ('in/<slug>') of a LinkedIn profile URL, or None if it is not one.
+
+    Scheme, host, query, fragment, trailing slash and sub-pages are ignored, and
+    the slug is percent-decoded and lowercased (slugs are case-insensitive):
+    'https://br.linkedin.com/in/Jo%C3%A3o-Silva/?trk=x' and
+    'linkedin.com/in/joão-silva' give the same key.
+    """
+    if not isinstance(url, str) or not url.strip():
+        return None
+    url = url.strip()
+    if '://' not in url:
+        url = f"https://{url}"
+    try:
+        parts = urllib.parse.urlsplit(url)
+        host = (parts.hostname or '').lower()
+    except ValueError:
+        return None
+    if not LINKEDIN_HOST_RE.search(host):
+        return None
+    segments = [segment for segment in parts.path.split('/') if segment]
+    if len(segments) < 2 or segments[0].lower() != 'in':
+        return None
+    slug = unicodedata.normalize('NFC', urllib.parse.unquote(segments[1])).strip().lower()
+    return f"in/{slug}" if slug else None
+
+def canonical_profile_url(url):
+    """The one URL kept for a profile ('https://www.linkedin.com/in/<slug>'), or None if `url` is not a profile."""
+    key = profile_key(url)
+    if key is None:
+        return None
+    return f"https://{CANONICAL_HOST}/{urllib.parse.quote(key)}"
@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+STATS_FILE = 'progress_stats.json'
+
+# The stats file is rewritten at most this often while rows come in
+FLUSH_INTERVAL = 5
+
+# Hourly buckets kept in the stats file
+MAX_HOURS = 48
+
+STATUSES = ('found', 'not_found', 'error')
+
+def empty_counts():
+    return {status: 0 for status in STATUSES}
+
+class ProgressStats:
+    """Running totals kept by the pipeline, so progress can be read without rescanning the roster.
+
+    Counts per status, per course and per hour accumulate across runs; the
+    roster figures and the current job (with its rate and ETA) are refreshed
+    by each job. The file is small and rewritten atomically.
+    """
+
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self.data = {
+            'status': empty_counts(),
+            'courses': {},
+            'hours': {},
+            'roster': {},
+            'job': {},
+            'master_count': 0,
+            'updated_at': None,
+        }
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.data.update(json.load(f))
+            except Exception as e:
+                print(f"⚠️  Ignorando estatísticas inválidas em {path}: {e}")
+
+    def start_job(self, job_id, expected, total_rows, total_recent, pending, master_count):
+        """Reset the current job's figures and refresh the roster counts."""
+        with self._lock:
+            self.data['roster'] = {'total_rows': total_rows, 'recent': total_recent, 'pending': pending}
+            self.data['job'] = {'id': job_id, 'expected': expected, 'done': 0, 'errors': 0, 'started_at': time.time()}
+            self.data['master_count'] = master_count
+        self.flush(force=True)
+
+    def record(self, status, course='', added=False):
+        """Count one searched row; `added` when its find was a new master record."""
+        hour = datetime.now().strftime('%Y-%m-%d %H:00')
+        with self._lock:
+            self.data['status'][status] += 1
+            self.data['courses'].setdefault(course or '(sem curso)', empty_counts())[status] += 1
+            hours = self.data['hours']
+            hours.setdefault(hour, empty_counts())[status] += 1
+            for old_hour in sorted(hours)[:-MAX_HOURS]:
+                del hours[old_hour]
+            job = self.data['job']
+            if status == 'error':
+                job['errors'] = job.get('errors', 0) + 1
+            else:
+                job['done'] = job.get('done', 0) + 1
+                if self.data['roster']:
+                    self.data['roster']['pending'] = max(0, self.data['roster']['pending'] - 1)
+            if added:
+                self.data['master_count'] += 1
+        self.flush()
+
+    def finish_job(self):
+        """Stamp the current job as ended (its rate stays as the basis for the backlog ETA)."""
+        with self._lock:
+            if self.data['job']:
+                self.data['job']['finished_at'] = time.time()
+        self.flush(force=True)
+
+    def flush(self, force=False):
+        """Rewrite the stats file if FLUSH_INTERVAL passed (or `force`)."""
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_flush < FLUSH_INTERVAL:
+                return
+            self._last_flush = now
+            self.data['updated_at'] = now
+            text = json.dumps(self.data, ensure_ascii=False, indent=2)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, self.path)
+
+def job_rate(data, now=None):
+    """Rows per minute of the current (or last) job, or 0.0."""
+    job = data.get('job') or {}
+    elapsed = (job.get('finished_at') or now or time.time()) - job.get('started_at', 0)
+    if not job or elapsed <= 0:
+        return 0.0
+    return (job.get('done', 0) + job.get('errors', 0)) / (elapsed / 60)
+
+def eta_seconds(remaining, rate_per_minute):
+    """Seconds left for `remaining` rows at the given rate, or None if unknown."""
+    if not rate_per_minute:
+        return None
+    return remaining / rate_per_minute * 60
+
+def load_stats(path=STATS_FILE):
+    """The stats file written by the pipeline, or None if there is none yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,140 @@
+import json
+import os
+import random
+import threading
+import time
+from names import PARTICLES
+from match_scoring import best_match
+from metrics import span
+from search_backends import SearchBlocked
+
+STATS_FILE = 'query_tier_stats.json'
+
+# A match at least this confident stops trying further query variants
+STOP_CONFIDENCE = 0.8
+
+# Most query variants tried per graduate
+MAX_TIERS = 3
+
+def _without_particles(name):
+    return ' '.join(token for token in name.split() if token.casefold() not in PARTICLES)
+
+def _short_name(name):
+    tokens = _without_particles(name).split()
+    return ' '.join([tokens[0], tokens[-1]]) if len(tokens) > 2 else ' '.join(tokens)
+
+# Query variants, in their default order: tier -> query builder(name, course, university)
+TIERS = {
+    'base': lambda name, course, university: f"linkedin {name} {university}",
+    'site': lambda name, course, university: f"site:linkedin.com/in {name} {university}",
+    'course': lambda name, course, university: f"linkedin {name} {course} {university}",
+    'short_name': lambda name, course, university: f"linkedin {_short_name(name)} {university}",
+    'no_particles': lambda name, course, university: f"site:linkedin.com/in {_without_particles(name)}",
+}
+
+class QueryPlanner:
+    """Orders query variants by observed hit rate and records the outcome of each one.
+
+    Hit rates are smoothed (hits + 1) / (attempts + 2), so untried tiers keep a
+    chance to prove themselves; stats persist across runs in STATS_FILE.
+    """
+
+    def __init__(self, path=STATS_FILE, max_tiers=MAX_TIERS, stop_confidence=STOP_CONFIDENCE):
+        self.path = path
+        self.max_tiers = max_tiers
+        self.stop_confidence = stop_confidence
+        self._lock = threading.Lock()
+        self.stats = {tier: {'attempts': 0, 'hits': 0} for tier in TIERS}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for tier, counts in json.load(f).items():
+                        if tier in self.stats:
+                            self.stats[tier].update(counts)
+            except Exception as e:
+                print(f"⚠️  Ignorando estatísticas de consultas inválidas em {path}: {e}")
+
+    def hit_rate(self, tier):
+        counts = self.stats[tier]
+        return (counts['hits'] + 1) / (counts['attempts'] + 2)
+
+    def queries(self, name, course='', university=''):
+        """(tier, query) pairs to try, best tier first, without duplicate queries."""
+        with self._lock:
+            order = sorted(TIERS, key=lambda tier: -self.hit_rate(tier))
+        planned = []
+        seen = set()
+        for tier in order:
+            query = ' '.join(TIERS[tier](name, course or '', university or '').split())
+            if query not in seen:
+                seen.add(query)
+                planned.append((tier, query))
+        return planned[:self.max_tiers]
+
+    def record(self, tier, hit):
+        with self._lock:
+            self.stats[tier]['attempts'] += 1
+            self.stats[tier]['hits'] += int(hit)
+
+    def save(self):
+        with self._lock:
+            stats = json.dumps(self.stats, indent=2)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(stats)
+
+    def summary(self):
+        parts = [
+            f"{tier} {counts['hits']}/{counts['attempts']}"
+            for tier, counts in self.stats.items() if counts['attempts']
+        ]
+        return f"🧭 Acertos por variante de consulta: {', '.join(parts)}" if parts else ''
+
+    def observe(self, tier, candidates, collected, name, course='', university=''):
+        """Merge a variant's candidates into `collected` and record its outcome.
+
+        Returns True when the variant produced a conclusive match.
+        """
+        for candidate in candidates:
+            collected.setdefault(candidate['url'], candidate)
+        linkedin_url, confidence = best_match(candidates, name, course, university)
+        self.record(tier, linkedin_url is not None)
+        return confidence >= self.stop_confidence
+
+def planned_search(search_query, planner, pacer=None, tier_delay=(1, 2)):
+    """Turn a query-level backend search into a per-graduate search over the planner's tiers.
+
+    Stops at the first variant that yields a conclusive match, or at a block
+    page. Every query outcome is fed to `pacer` (an AdaptivePacer), which also
+    paces the variants; without one they are `tier_delay` seconds apart.
+    Returns every candidate seen ([] if none), or None if all variants failed.
+    """
+    def search(client, name, university, course=''):
+        collected = {}
+        errors = 0
+        for i, (tier, query) in enumerate(planner.queries(name, course, university)):
+            if i:
+                with span('pacing'):
+                    if pacer is not None:
+                        pacer.wait()
+                    elif tier_delay:
+                        time.sleep(random.uniform(*tier_delay))
+            try:
+                with span('query', tier=tier):
+                    candidates = search_query(client, query)
+            except SearchBlocked as e:
+                print(f"      🚫 Bloqueio detectado: {e}")
+                if pacer is not None:
+                    pacer.observe('blocked')
+                errors += 1
+                break
+            if pacer is not None:
+                pacer.observe('error' if candidates is None else 'ok' if candidates else 'empty')
+            if candidates is None:
+                errors += 1
+                continue
+            if planner.observe(tier, candidates, collected, name, course, university):
+                break
+        if not collected and errors:
+            return None
+        return list(collected.values())
+    return search
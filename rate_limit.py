@@ -0,0 +1,139 @@
+import asyncio
+import collections
+import random
+import threading
+import time
+import urllib.parse
+
+# Default request budget per search host
+DEFAULT_HOST_RATE = 0.5   # requests per second
+DEFAULT_HOST_BURST = 2    # requests allowed back-to-back after idling
+
+class TokenBucket:
+    """Token bucket: `rate` tokens per second, holding at most `capacity` tokens."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class HostRateLimiter:
+    """One token bucket per host, created on first use."""
+
+    def __init__(self, rate=DEFAULT_HOST_RATE, burst=DEFAULT_HOST_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+
+    def bucket(self, url):
+        host = urllib.parse.urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    async def acquire(self, url):
+        """Wait for the request budget of the host serving `url`."""
+        await self.bucket(url).acquire()
+
+    def set_rate(self, rate):
+        """Change the request rate of every host (used by adaptive pacing)."""
+        self.rate = rate
+        for bucket in self.buckets.values():
+            bucket._refill()
+            bucket.rate = rate
+
+class AdaptivePacer:
+    """AIMD pacing between queries, shared by every session of a run.
+
+    While recent queries mostly succeed the delay shrinks by `step` (additive
+    increase of the request rate); a block page, or a streak of empty result
+    pages, multiplies it by `backoff` and pauses all sessions for a cooldown
+    that doubles with each consecutive block.
+    """
+
+    def __init__(self, delay=3.0, min_delay=1.0, max_delay=60.0, step=0.05, backoff=2.0,
+                 empty_streak=5, cooldown=30.0, max_cooldown=900.0, window=20, healthy_rate=0.8):
+        self.delay = delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.step = step
+        self.backoff = backoff
+        self.empty_streak = empty_streak
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.healthy_rate = healthy_rate
+        self.recent = collections.deque(maxlen=window)
+        self.empties = 0
+        self.consecutive_blocks = 0
+        self.blocks = 0
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _back_off(self):
+        self.delay = min(self.max_delay, self.delay * self.backoff)
+        self.consecutive_blocks += 1
+        self.blocks += 1
+        pause = min(self.max_cooldown, self.cooldown * 2 ** (self.consecutive_blocks - 1))
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def observe(self, outcome):
+        """Feed one query outcome: 'ok' (candidates found), 'empty', 'error' or 'blocked'."""
+        with self._lock:
+            self.recent.append(outcome == 'ok')
+            if outcome == 'blocked':
+                self.empties = 0
+                self._back_off()
+            elif outcome == 'empty':
+                self.empties += 1
+                if self.empties >= self.empty_streak:
+                    # A run of empty pages is how soft blocks usually look
+                    self.empties = 0
+                    self._back_off()
+            elif outcome == 'error':
+                self.delay = min(self.max_delay, self.delay * (1 + (self.backoff - 1) / 2))
+            else:
+                self.empties = 0
+                self.consecutive_blocks = 0
+                if sum(self.recent) >= self.healthy_rate * len(self.recent):
+                    self.delay = max(self.min_delay, self.delay - self.step)
+
+    @property
+    def rate(self):
+        """Current request rate (queries per second) implied by the delay."""
+        return 1 / self.delay
+
+    def cooldown_left(self):
+        return max(0.0, self.paused_until - time.monotonic())
+
+    def next_delay(self):
+        """Seconds to wait before this session's next query: jittered delay plus any cooldown."""
+        with self._lock:
+            delay = self.delay
+        return random.uniform(0.75, 1.25) * delay + self.cooldown_left()
+
+    def wait(self):
+        time.sleep(self.next_delay())
+
+    def batch_pause(self):
+        """Pause between serial batches, scaled with the current delay (30s at the default 3s)."""
+        return 10 * self.delay + self.cooldown_left()
+
+    def summary(self):
+        return f"🚦 Ritmo adaptativo: atraso atual {self.delay:.2f}s, {self.blocks} bloqueios detectados"
@@ -0,0 +1,184 @@
+import csv
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from graduates import CHUNK_SIZE, DATE_COLUMN, is_recent_graduate, recent_cutoff_year
+from names import person_key
+
+SNAPSHOT_FILE = 'roster_snapshot.db'
+
+# Roster columns that make up a row's fingerprint, in the order they are stored
+ROSTER_COLUMNS = ['Nome', DATE_COLUMN, 'Curso', 'Faculdade']
+
+# Rows per statement when writing or looking up a batch of fingerprints
+BATCH_ROWS = 500
+
+def cell(value):
+    """A roster cell as a stripped string ('' for missing values, e.g. pandas NaN)."""
+    return value.strip() if isinstance(value, str) else ''
+
+def row_fingerprint(row):
+    """Stable signed 64-bit fingerprint of a row's name, graduation date, course and university.
+
+    Any edit to one of them (a fixed name, a new course) gives a new fingerprint.
+    """
+    text = '\x1f'.join(cell(row.get(column)) for column in ROSTER_COLUMNS)
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def batches(items, size=BATCH_ROWS):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class RosterSnapshot:
+    """Last-seen state of each roster CSV, so a run only looks at rows added or edited since.
+
+    Every distinct row is kept under its fingerprint with a 'settled' flag.
+    refresh() diffs the CSV against the snapshot: new fingerprints come in
+    unsettled, vanished ones are dropped. A row settles once it is searched
+    (settle) or its person is already in the master store (settle_known);
+    changed_chunks() streams the unsettled rows, so the work after a weekly
+    drop is proportional to what changed, not to the whole file. An unchanged
+    file (same size and modification time) is not read at all.
+    """
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # A lost settle only means a row is looked at once more
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS rosters (
+                roster TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                total_rows INTEGER NOT NULL,
+                taken_at REAL NOT NULL,
+                recent_rows INTEGER,
+                cutoff_year INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS roster_rows (
+                roster TEXT NOT NULL,
+                fingerprint INTEGER NOT NULL,
+                nome TEXT NOT NULL,
+                data_colacao TEXT NOT NULL,
+                curso TEXT NOT NULL,
+                faculdade TEXT NOT NULL,
+                settled INTEGER NOT NULL,
+                UNIQUE (roster, fingerprint)
+            );
+            CREATE INDEX IF NOT EXISTS idx_roster_rows_settled ON roster_rows (roster, settled);
+        """)
+        # Snapshots taken before the recent rows were counted; their rosters are read again once
+        existing_columns = {row[1] for row in self.conn.execute("PRAGMA table_info(rosters)")}
+        if 'recent_rows' not in existing_columns:
+            self.conn.execute("ALTER TABLE rosters ADD COLUMN recent_rows INTEGER")
+            self.conn.execute("ALTER TABLE rosters ADD COLUMN cutoff_year INTEGER")
+        self.conn.commit()
+
+    @staticmethod
+    def roster_id(roster_path):
+        return os.path.abspath(roster_path)
+
+    def refresh(self, roster_path, encoding='utf-8-sig'):
+        """Diff the CSV against its snapshot and store the new state.
+
+        Returns (total_rows, recent_rows, added, modified, removed): the first
+        two count the whole CSV, as count_graduates would; a modified row keeps
+        its person (name and graduation date) with other fields edited; a fixed
+        name counts as one removed and one added row. The file is read again
+        when the recent cutoff year has moved since the last refresh.
+        """
+        roster = self.roster_id(roster_path)
+        stat = os.stat(roster_path)
+        cutoff_year = recent_cutoff_year()
+        with self._lock:
+            known = self.conn.execute(
+                "SELECT size, mtime_ns, cutoff_year, total_rows, recent_rows FROM rosters WHERE roster = ?", (roster,)
+            ).fetchone()
+        if known is not None and known[:3] == (stat.st_size, stat.st_mtime_ns, cutoff_year):
+            return known[3], known[4], 0, 0, 0
+
+        with self._lock:
+            stored = {row[0] for row in self.conn.execute(
+                "SELECT fingerprint FROM roster_rows WHERE roster = ?", (roster,))}
+        seen = set()
+        new_rows = []
+        total_rows = recent_rows = 0
+        with open(roster_path, 'r', encoding=encoding, newline='') as f:
+            for row in csv.DictReader(f):
+                total_rows += 1
+                recent_rows += is_recent_graduate(cell(row.get(DATE_COLUMN)))
+                fingerprint = row_fingerprint(row)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+                if fingerprint not in stored:
+                    values = [cell(row.get(column)) for column in ROSTER_COLUMNS]
+                    # Graduates too old to search are settled from the start
+                    new_rows.append((roster, fingerprint, *values, 0 if is_recent_graduate(values[1]) else 1))
+        vanished = stored - seen
+
+        with self._lock:
+            vanished_people = set()
+            for batch in batches(vanished):
+                vanished_people.update(person_key(name, date) for name, date in self.conn.execute(
+                    f"SELECT nome, data_colacao FROM roster_rows WHERE roster = ? "
+                    f"AND fingerprint IN ({', '.join('?' * len(batch))})", (roster, *batch)))
+                self.conn.execute(
+                    f"DELETE FROM roster_rows WHERE roster = ? AND fingerprint IN ({', '.join('?' * len(batch))})",
+                    (roster, *batch))
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO roster_rows VALUES ({', '.join('?' * 7)})", new_rows)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rosters (roster, size, mtime_ns, total_rows, taken_at, recent_rows, cutoff_year) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (roster, stat.st_size, stat.st_mtime_ns, total_rows, time.time(), recent_rows, cutoff_year))
+            self.conn.commit()
+
+        new_people = {person_key(row[2], row[3]) for row in new_rows}
+        modified = sum(1 for row in new_rows if person_key(row[2], row[3]) in vanished_people)
+        removed = len(vanished_people - new_people)
+        return total_rows, recent_rows, len(new_rows) - modified, modified, removed
+
+    def settle(self, roster_path, row):
+        """Mark one row as done with (searched, found or not)."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE roster_rows SET settled = 1 WHERE roster = ? AND fingerprint = ?",
+                (self.roster_id(roster_path), row_fingerprint(row)))
+            self.conn.commit()
+
+    def settle_known(self, roster_path, index):
+        """Settle the unsettled rows whose person is in `index` (a NameIndex). Returns how many."""
+        roster = self.roster_id(roster_path)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT fingerprint, nome, data_colacao FROM roster_rows WHERE roster = ? AND settled = 0",
+                (roster,)).fetchall()
+            known = [(roster, fingerprint) for fingerprint, name, date in rows if index.contains(name, date)]
+            self.conn.executemany(
+                "UPDATE roster_rows SET settled = 1 WHERE roster = ? AND fingerprint = ?", known)
+            self.conn.commit()
+        return len(known)
+
+    def changed_chunks(self, roster_path, chunksize=CHUNK_SIZE):
+        """Yield the unsettled rows as roster DataFrames of up to `chunksize` rows, in CSV order."""
+        import pandas as pd
+        roster = self.roster_id(roster_path)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT nome, data_colacao, curso, faculdade FROM roster_rows "
+                "WHERE roster = ? AND settled = 0 ORDER BY rowid", (roster,)).fetchall()
+        # Index continues across chunks, as with read_csv(chunksize=...)
+        for start in range(0, len(rows), chunksize):
+            batch = rows[start:start + chunksize]
+            yield pd.DataFrame(batch, columns=ROSTER_COLUMNS, index=range(start, start + len(batch)), dtype=str)
+
+    def close(self):
+        self.conn.close()
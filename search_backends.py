@@ -0,0 +1,201 @@
+import base64
+import html
+import os
+import re
+import urllib.parse
+from metrics import span
+from profile_urls import canonical_profile_url
+
+# Search form used by the browser backend, and the non-JS results page served as plain HTML.
+# Both can be pointed at a local mock (mock_search_server.py) through the environment.
+DDG_URL = os.environ.get('DDG_URL', "https://duckduckgo.com")
+DDG_HTML_URL = os.environ.get('DDG_HTML_URL', "https://html.duckduckgo.com/html/")
+
+# Plain-HTML results pages of the other engines the multi-engine backend spreads queries over
+BING_URL = os.environ.get('BING_URL', "https://www.bing.com/search")
+MOJEEK_URL = os.environ.get('MOJEEK_URL', "https://www.mojeek.com/search")
+BRAVE_URL = os.environ.get('BRAVE_URL', "https://search.brave.com/search")
+
+# Search engines with a non-JS results page: name -> (results URL, HTTP method, request budget per second)
+SEARCH_ENGINES = {
+    'duckduckgo': (DDG_HTML_URL, 'post', 0.5),
+    'bing': (BING_URL, 'get', 0.5),
+    'mojeek': (MOJEEK_URL, 'get', 0.3),
+    'brave': (BRAVE_URL, 'get', 0.3),
+}
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Next stop of the scan: an <a tag, or markup an HTML parser never turns into links, skipped whole
+# (comments, '<!...>' declarations, script/style bodies; run to the end of the page when unclosed)
+MARKUP_RE = re.compile(r"(<a\s)|<!--.*?(?:-->|\Z)|<![^>]*(?:>|\Z)|<(script|style)\b.*?(?:</\2\s*>|\Z)",
+                       re.IGNORECASE | re.DOTALL)
+
+# The inside of an <a ...> opening tag, up to its '>'. As in an HTML parser, a quote opens a value only
+# right after '=' (quoted values may contain '>'). Runs without '>' or '=' are taken whole ('(?=(...))\2'
+# is an atomic group), so the match never backtracks and stops at the tag's '>' or the end of the page
+A_TAG_BODY_RE = re.compile(r"""((?=([^>=]+))\2|=+\s*(?:"[^"]*"|'[^']*')?)*""")
+
+# End of a link's text: its </a>, or the next <a for an unclosed tag (the end of the page for the last one)
+A_END_RE = re.compile(r'</a\s*>|<a\s', re.IGNORECASE)
+
+# href attribute (not data-href and the like); a repeated href keeps the last value, as BeautifulSoup does
+HREF_RE = re.compile(r"""(?:^|\s)href\s*=+\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+INNER_TAG_RE = re.compile(r'<[^>]+>')
+
+# Text DuckDuckGo shows on challenge / anomaly pages instead of results
+BLOCK_MARKERS = ('anomaly-modal', 'bots use duckduckgo too', 'select all squares', 'captcha', 'unusual traffic')
+
+# HTTP statuses that mean the host is throttling us
+BLOCK_STATUSES = {403, 418, 429}
+
+class SearchBlocked(Exception):
+    """The search host answered with a challenge or throttling page instead of results."""
+
+# Runs in the browser: [href, result text] for links that can lead to LinkedIn
+BROWSER_LINKS_JS = """
+return Array.from(document.querySelectorAll('a[href]'))
+    .filter(a => a.getAttribute('href').includes('linkedin.com') || a.getAttribute('href').includes('uddg=')
+                 || a.getAttribute('href').includes('bing.com/ck/a'))
+    .map(a => [a.getAttribute('href'), (a.closest('article, .result') || a).innerText]);
+"""
+
+def clean_linkedin_links(links):
+    """Unwrap redirects and return de-duplicated LinkedIn profile candidates (canonical URLs), in page order.
+
+    `links` yields (href, text) pairs; each candidate is {'url', 'text'}, with the
+    text of every link to the same profile (title, snippet) joined together.
+    """
+    candidates = {}
+    for href, text in links:
+        # Unwrap DuckDuckGo redirect URLs (the target is percent-encoded)
+        if '/l/?uddg=' in href:
+            href = urllib.parse.unquote(href.split('uddg=')[1].split('&')[0])
+        # Unwrap Bing click-tracking URLs (the target is base64 after 'u=a1')
+        elif 'bing.com/ck/a' in href and 'u=a1' in href:
+            encoded = href.split('u=a1')[1].split('&')[0]
+            try:
+                href = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode('utf-8')
+            except ValueError:
+                continue
+        if not href.startswith('http'):
+            continue
+
+        # Regional hosts, tracking parameters and slug spellings of one profile collapse into one URL
+        clean_url = canonical_profile_url(href)
+        if clean_url is None:
+            continue
+        text = ' '.join((text or '').split())
+        if clean_url not in candidates:
+            candidates[clean_url] = {'url': clean_url, 'text': text}
+        elif text and text not in candidates[clean_url]['text']:
+            candidates[clean_url]['text'] += ' ' + text
+
+    return list(candidates.values())
+
+def extract_linkedin_candidates(page_source):
+    """Extract LinkedIn profile candidates ({'url', 'text'}) from a results page.
+
+    Scans <a> tags with regexes instead of building a parse tree; the URLs
+    match extract_linkedin_urls_soup().
+    """
+    if 'linkedin.com' not in page_source:
+        return []
+
+    links = []
+    position = 0
+    while True:
+        start = MARKUP_RE.search(page_source, position)
+        if start is None:
+            break
+        if start.group(1) is None:
+            position = start.end()
+            continue
+        position = A_TAG_BODY_RE.match(page_source, start.end()).end()
+        if position == len(page_source):
+            # Never closed: every later '<a' would run to the end of the page as well
+            break
+        hrefs = HREF_RE.findall(page_source, start.start(), position)
+        position += 1
+        if hrefs:
+            href = html.unescape(''.join(hrefs[-1]))
+            end = A_END_RE.search(page_source, position)
+            text = page_source[position:end.start() if end else len(page_source)]
+            links.append((href, html.unescape(INNER_TAG_RE.sub(' ', text))))
+    return clean_linkedin_links(links)
+
+def extract_linkedin_urls(page_source):
+    """Extract clean, de-duplicated LinkedIn profile URLs from a results page."""
+    return [candidate['url'] for candidate in extract_linkedin_candidates(page_source)]
+
+def extract_linkedin_urls_soup(page_source):
+    """Reference extractor using a full BeautifulSoup parse."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(page_source, 'html.parser')
+    links = ((link['href'], link.get_text(' ')) for link in soup.find_all('a', href=True))
+    return [candidate['url'] for candidate in clean_linkedin_links(links)]
+
+def extract_linkedin_candidates_in_browser(driver):
+    """Extract LinkedIn profile candidates with a selector query run in the browser.
+
+    Only the matching links cross the wire, instead of the whole page_source.
+    """
+    return clean_linkedin_links(driver.execute_script(BROWSER_LINKS_JS) or [])
+
+def is_block_page(page_source):
+    """Whether a results page is really a challenge page."""
+    text = page_source.casefold()
+    return any(marker in text for marker in BLOCK_MARKERS)
+
+def browser_is_blocked(driver):
+    """Whether the page in the browser is a challenge page (checked in-page, without page_source)."""
+    return is_block_page(driver.execute_script(
+        "return document.documentElement ? document.documentElement.innerHTML.slice(0, 20000) : ''"
+    ) or '')
+
+def setup_http_session(pool_size=10):
+    """Setup a pooled HTTP session for the non-JS results page."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    })
+    return session
+
+def fetch_results_page(session, query, timeout=10, engine='duckduckgo'):
+    """Fetch an engine's HTML results page for a query (DuckDuckGo by default)."""
+    url, method, _ = SEARCH_ENGINES[engine]
+    if method == 'post':
+        response = session.post(url, data={'q': query}, timeout=timeout)
+    else:
+        response = session.get(url, params={'q': query}, timeout=timeout)
+    if response.status_code in BLOCK_STATUSES:
+        raise SearchBlocked(f"HTTP {response.status_code}")
+    response.raise_for_status()
+    return response.text
+
+def search_query_candidates_http(session, query, engine='duckduckgo'):
+    """Run one query over plain HTTP and return LinkedIn candidates ([] if none, None on error).
+
+    Raises SearchBlocked on a challenge page, so the caller can back off.
+    """
+    try:
+        with span('fetch'):
+            page_source = fetch_results_page(session, query, engine=engine)
+        with span('parse'):
+            candidates = extract_linkedin_candidates(page_source)
+        if not candidates and is_block_page(page_source):
+            raise SearchBlocked("página de desafio")
+        return candidates
+
+    except SearchBlocked:
+        raise
+    except Exception as e:
+        print(f"      Search error: {e}")
+        return None
@@ -0,0 +1,90 @@
+import json
+import sqlite3
+import threading
+import time
+from names import fold_text
+from match_scoring import best_match
+
+CACHE_FILE = 'search_cache.db'
+
+# "Not Found" results are searched again after this many days; finds never expire
+NEGATIVE_TTL_DAYS = 7
+
+def normalize_query(name, university):
+    """Normalize (name, university) into a cache key: accent-folded, casefolded, single-spaced."""
+    return f"{fold_text(name)}|{fold_text(university)}"
+
+class SearchCache:
+    """SQLite cache of search results per normalized query, shared by all workers of a run."""
+
+    def __init__(self, path=CACHE_FILE, negative_ttl_days=NEGATIVE_TTL_DAYS):
+        self.path = path
+        self.negative_ttl = negative_ttl_days * 86400
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                query_key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                university TEXT NOT NULL,
+                urls TEXT NOT NULL,
+                linkedin_url TEXT,
+                searched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def _is_fresh(self, linkedin_url, searched_at, now):
+        return bool(linkedin_url) or now - searched_at < self.negative_ttl
+
+    def get(self, name, university):
+        """Return the cached candidates ({'url', 'text'}), or None if missing or expired."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT urls, linkedin_url, searched_at FROM searches WHERE query_key = ?",
+                (normalize_query(name, university),)
+            ).fetchone()
+        if row is None or not self._is_fresh(row[1], row[2], time.time()):
+            return None
+        # Entries written before candidates carried result text are plain URLs
+        return [c if isinstance(c, dict) else {'url': c, 'text': ''} for c in json.loads(row[0])]
+
+    def put(self, name, university, candidates):
+        """Store the candidates for a query, with the best name match as the parsed result."""
+        linkedin_url, _ = best_match(candidates, name, university=university)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_query(name, university), name, university, json.dumps(candidates, ensure_ascii=False),
+                 linkedin_url, time.time())
+            )
+            self.conn.commit()
+
+    def recent_miss_keys(self):
+        """Normalized keys of "Not Found" queries still within the negative TTL."""
+        cutoff = time.time() - self.negative_ttl
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT query_key FROM searches WHERE linkedin_url IS NULL AND searched_at >= ?",
+                (cutoff,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def close(self):
+        self.conn.close()
+
+def cached_search(search, cache):
+    """Wrap a backend search function so hits are served from the cache.
+
+    Errors (None) are not cached, so a failed query is retried on the next run.
+    """
+    def search_with_cache(client, name, university, course=''):
+        candidates = cache.get(name, university)
+        if candidates is not None:
+            return candidates
+        candidates = search(client, name, university, course)
+        if candidates is not None:
+            cache.put(name, university, candidates)
+        return candidates
+    return search_with_cache
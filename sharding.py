@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import zlib
+from names import NameIndex, name_key
+from master_store import MasterStore
+
+def parse_shard(spec):
+    """'2/4' -> (2, 4): this node searches shard 2 of 4 (1-based)."""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard inválido '{spec}', use i/N (ex.: 1/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard inválido '{spec}', i deve estar entre 1 e N")
+    return index, count
+
+def shard_path(path, shard):
+    """A node's own copy of a file: 'x.db' -> 'x_shard2of4.db' (unchanged when not sharded)."""
+    if not shard:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_shard{shard[0]}of{shard[1]}{ext}"
+
+def shard_of(name, count):
+    """1-based shard of a graduate: a stable hash of the name key (names.name_key), the same on every host."""
+    return zlib.crc32(name_key(name).encode('utf-8')) % count + 1
+
+def shard_mask(chunk, shard):
+    """Boolean mask of the chunk's rows that belong to `shard` (index, count)."""
+    import pandas as pd
+    index, count = shard
+    return pd.Series([shard_of(name, count) == index for name in chunk['Nome']], index=chunk.index)
+
+def read_partial(path):
+    """Records of a node's partial store: its .db file or its exported JSON."""
+    if path.endswith('.db'):
+        partial = MasterStore(path, master_file='')
+        try:
+            return partial.records()
+        finally:
+            partial.close()
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def merge_partials(paths, store):
+    """Merge partial stores into the master store, de-duplicating by person, profile and id.
+
+    A graduate already in the store (same person key, see names.person_key)
+    keeps its first profile; a record whose id is already taken by a different
+    profile gets a new id. Returns (added, duplicates).
+    """
+    people = NameIndex((r.get('Nome', ''), r.get('Data da Colação', '')) for r in store.records())
+    added = duplicates = 0
+    for path in paths:
+        for record in read_partial(path):
+            name, graduation_date = record.get('Nome', ''), record.get('Data da Colação', '')
+            if people.contains(name, graduation_date) or store.has_url(record.get('LinkedIn URL', '')):
+                duplicates += 1
+                continue
+            if record.get('id') and store.has_id(record['id']):
+                record = dict(record, id=store.new_id())
+            if store.add(record):
+                people.add(name, graduation_date)
+                added += 1
+            else:
+                duplicates += 1
+    return added, duplicates
@@ -0,0 +1,26 @@
+from cohort_search import assign_matches
+
+ROWS = [
+    {'Nome': 'Julia Yahagi Estevam', 'Curso': 'Engenharia Civil', 'Faculdade': 'UNESP'},
+    {'Nome': 'Vinicius Vieira Natal', 'Curso': 'Engenharia Civil', 'Faculdade': 'UNESP'},
+]
+
+def candidate(slug, text):
+    return {'url': f'https://www.linkedin.com/in/{slug}', 'text': text}
+
+def test_name_match_with_university_settles_the_row():
+    matches = assign_matches(ROWS, [0, 1], [candidate('julia-yahagi-estevam', 'Julia Yahagi Estevam - UNESP')])
+    assert list(matches) == [0]
+
+def test_homonym_from_another_school_is_left_for_its_own_search():
+    found = [candidate('julia-yahagi-estevam', 'Julia Yahagi Estevam - Medicina - USP')]
+    assert assign_matches(ROWS, [0, 1], found) == {}
+
+def test_profile_claimed_by_two_rows_is_rejected():
+    rows = ROWS + [{'Nome': 'Julia Yahagi Estevam', 'Curso': 'Arquitetura', 'Faculdade': 'UNESP'}]
+    found = [candidate('julia-yahagi-estevam', 'Julia Yahagi Estevam - UNESP')]
+    assert assign_matches(rows, [0, 1, 2], found) == {}
+
+def test_near_name_is_not_settled():
+    found = [candidate('juliana-estevam', 'Juliana Estevam - Engenharia Civil - UNESP')]
+    assert assign_matches(ROWS, [0, 1], found) == {}
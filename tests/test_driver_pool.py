@@ -0,0 +1,14 @@
+import pytest
+from driver_pool import SessionPool
+
+def test_session_released_after_close_is_closed_not_orphaned():
+    closed = []
+    pool = SessionPool(object, closed.append, size=2)
+    assert pool.prewarm() == 2
+    in_flight = pool.acquire()
+    pool.close()
+    assert len(closed) == 1
+    pool.release(in_flight)
+    assert closed[-1] is in_flight.client and pool.idle.empty()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,54 @@
+import os
+import time
+import pytest
+from mock_search_server import load_recorded_pages
+from search_backends import extract_linkedin_candidates, extract_linkedin_urls, extract_linkedin_urls_soup
+
+# Saved results pages, also servable by the mock: python mock_search_server.py --pages tests/fixtures/pages
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'pages')
+
+def page(name):
+    with open(os.path.join(PAGES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+PAGE_NAMES = sorted(name for name in os.listdir(PAGES_DIR) if name.endswith('.html'))
+
+@pytest.mark.parametrize('page_source', load_recorded_pages(PAGES_DIR), ids=PAGE_NAMES)
+def test_regex_extractor_matches_soup(page_source):
+    assert extract_linkedin_urls(page_source) == extract_linkedin_urls_soup(page_source)
+
+def test_duckduckgo_redirects_are_unwrapped_and_canonical():
+    assert extract_linkedin_urls(page('duckduckgo_results.html')) == [
+        'https://www.linkedin.com/in/julia-yahagi-estevam-d8987c',
+        'https://www.linkedin.com/in/julia-estevam',
+    ]
+
+def test_bing_redirects_and_profile_variants_collapse():
+    assert extract_linkedin_urls(page('bing_results.html')) == [
+        'https://www.linkedin.com/in/vinicius-vieira-natal-53f0f2',
+        'https://www.linkedin.com/in/vinicius-natal',
+    ]
+
+def test_tricky_markup():
+    urls = extract_linkedin_urls(page('tricky_markup.html'))
+    assert 'https://www.linkedin.com/in/fake-data-href' not in urls
+    # Links in comments and script/style bodies are not links; of two hrefs, the last one wins
+    assert urls == [
+        'https://www.linkedin.com/in/ana-paula-souza',
+        'https://www.linkedin.com/in/carlos-mendes-7f1',
+        'https://www.linkedin.com/in/jo%C3%A3o-silva',
+        'https://www.linkedin.com/in/segundo-href',
+        'https://www.linkedin.com/in/aspas-soltas',
+        'https://www.linkedin.com/in/sem-fechamento-9',
+    ]
+
+def test_unclosed_quotes_do_not_rescan_the_page():
+    # Each '<a' used to scan on to the end of the page looking for its '>': seconds on ~55KB
+    page_source = 'linkedin.com ' + '<a href="x ' * 5000
+    start = time.perf_counter()
+    assert extract_linkedin_urls(page_source) == []
+    assert time.perf_counter() - start < 0.5
+
+def test_candidate_text_joins_every_link_to_the_profile():
+    first = extract_linkedin_candidates(page('duckduckgo_results.html'))[0]
+    assert 'UNESP' in first['text'] and 'Engenharia Civil' in first['text']
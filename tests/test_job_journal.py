@@ -0,0 +1,22 @@
+import pandas as pd
+from job_journal import JobJournal
+from linkedin_production import pending_filter
+from names import NameIndex
+
+def test_resume_skips_finished_rows_with_a_blank_university(tmp_path):
+    roster = tmp_path / 'roster.csv'
+    roster.write_text("Nome,Data da Colação,Curso,Faculdade\n"
+                      "Ana Costa,2024-12-01,Direito,\n"
+                      "Bruno Lima,2024-12-01,Direito,USP\n", encoding='utf-8')
+    chunk = pd.read_csv(roster)
+    assert chunk['Faculdade'].isna()[0]
+
+    journal = JobJournal(str(tmp_path / 'journal.db'))
+    job_id = journal.start({'count': 2})
+    journal.record(job_id, chunk.iloc[0], 'not_found')
+    journal.set_status(job_id, 'interrupted')
+
+    resumed_id, _ = journal.last_unfinished()
+    is_pending = pending_filter(NameIndex(), journal.done_keys(resumed_id))
+    assert list(chunk[is_pending(chunk)]['Nome']) == ['Bruno Lima']
+    journal.close()
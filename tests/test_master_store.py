@@ -0,0 +1,42 @@
+import json
+import sqlite3
+from master_store import MasterStore
+from profile_urls import canonical_profile_url, profile_key
+
+def record(name, url):
+    return {'Nome': name, 'Data da Colação': '29/08/2025', 'LinkedIn URL': url}
+
+def test_profile_key_ignores_host_case_encoding_and_suffixes():
+    assert (profile_key('https://br.linkedin.com/in/Jo%C3%A3o-Silva/?trk=x')
+            == profile_key('linkedin.com/in/joão-silva')
+            == profile_key('https://www.linkedin.com/in/joão-silva/details/experience#top'))
+    assert profile_key('https://www.linkedin.com/company/unesp') is None
+    assert profile_key('https://notlinkedin.com/in/x') is None
+    assert canonical_profile_url('https://br.linkedin.com/in/Ana-X/') == 'https://www.linkedin.com/in/ana-x'
+
+def test_store_keeps_one_canonical_copy_per_profile(tmp_path):
+    store = MasterStore(str(tmp_path / 'm.db'), master_file=str(tmp_path / 'm.json'))
+    assert store.add(record('Ana X', 'https://br.linkedin.com/in/ana-x'))
+    assert not store.add(record('Ana X', 'https://www.linkedin.com/in/Ana-X/'))
+    assert store.has_url('linkedin.com/in/ANA-x')
+    store.export_json()
+    store.close()
+    with open(tmp_path / 'm.json', encoding='utf-8') as f:
+        assert [r['LinkedIn URL'] for r in json.load(f)] == ['https://www.linkedin.com/in/ana-x']
+
+def test_old_store_is_keyed_and_deduplicated_on_open(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE profiles (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE,
+                    nome TEXT NOT NULL, curso TEXT, faculdade TEXT, data_colacao TEXT,
+                    linkedin_url TEXT NOT NULL UNIQUE, confidence REAL, last_updated TEXT)""")
+    # The last copy of ana-x already has the canonical URL the first one is rewritten to
+    for i, url in enumerate(['https://br.linkedin.com/in/ana-x', 'https://www.linkedin.com/in/Ana-X/',
+                             'https://br.linkedin.com/in/bob', 'https://www.linkedin.com/in/ana-x']):
+        conn.execute("INSERT INTO profiles (id, nome, linkedin_url) VALUES (?, ?, ?)", (f'id{i}', f'n{i}', url))
+    conn.commit()
+    conn.close()
+    store = MasterStore(path, master_file=str(tmp_path / 'none.json'))
+    assert [r['LinkedIn URL'] for r in store.records()] == ['https://www.linkedin.com/in/ana-x',
+                                                            'https://www.linkedin.com/in/bob']
+    store.close()
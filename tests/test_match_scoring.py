@@ -0,0 +1,47 @@
+from match_scoring import MIN_CONFIDENCE, NAME_WEIGHT, best_match, score_candidate
+
+def candidate(url, text=''):
+    return {'url': url, 'text': text}
+
+def test_short_first_name_does_not_match_inside_another_name():
+    assert score_candidate(candidate('https://www.linkedin.com/in/mariana-silva-123'), 'Ana Silva') < NAME_WEIGHT
+
+def test_near_name_is_not_accepted():
+    url, confidence = best_match([candidate('https://www.linkedin.com/in/luana-costa')], 'Ana Maria Costa')
+    assert url is None and confidence < MIN_CONFIDENCE
+
+def test_first_name_with_course_and_university_is_not_accepted():
+    other = candidate('https://www.linkedin.com/in/joao-pereira', 'João Pereira - Engenharia Civil - UNESP')
+    assert score_candidate(other, 'João Carlos Mendes', 'Engenharia Civil', 'UNESP') >= MIN_CONFIDENCE
+    url, confidence = best_match([other], 'João Carlos Mendes', 'Engenharia Civil', 'UNESP')
+    assert url is None and confidence == 0.6
+
+def test_first_name_with_university_is_not_accepted():
+    other = candidate('https://www.linkedin.com/in/ana-souza', 'Ana Souza - USP')
+    url, confidence = best_match([other], 'Ana Maria Costa', university='USP')
+    assert url is None and confidence == 0.5
+
+def test_surname_match_is_preferred_over_a_higher_first_name_only_score():
+    other = candidate('https://www.linkedin.com/in/ana-souza', 'Ana Souza - Engenharia Civil - USP')
+    same = candidate('https://www.linkedin.com/in/ana-costa-9f')
+    url, confidence = best_match([other, same], 'Ana Maria Costa', 'Engenharia Civil', 'USP')
+    assert url == same['url'] and confidence == 0.6
+
+def test_concatenated_slug_matches_the_names_in_order():
+    assert score_candidate(candidate('https://www.linkedin.com/in/juliayahagiestevam-d8987c'),
+                           'Julia Yahagi Estevam') == NAME_WEIGHT
+    assert score_candidate(candidate('https://www.linkedin.com/in/juliaestevam'), 'Julia Estevam') == NAME_WEIGHT
+    # One of two surnames: half the surname credit
+    assert score_candidate(candidate('https://www.linkedin.com/in/juliaestevam'), 'Julia Yahagi Estevam') == 0.6
+
+def test_concatenated_slug_must_be_spelled_out_entirely():
+    assert score_candidate(candidate('https://www.linkedin.com/in/mariana'), 'Maria Silva') == 0.0
+    assert score_candidate(candidate('https://www.linkedin.com/in/anasilvaxyz'), 'Ana Silva') == 0.0
+
+def test_separated_slug_tokens_match_whole():
+    assert score_candidate(candidate('https://www.linkedin.com/in/vinicius-vieira-natal-53f0f2'),
+                           'Vinicius Vieira Natal') == NAME_WEIGHT
+
+def test_course_and_university_add_to_the_name():
+    found = candidate('https://www.linkedin.com/in/ana-silva', 'Ana Silva - Engenharia Civil - UNESP')
+    assert score_candidate(found, 'Ana Silva', 'Engenharia Civil', 'UNESP') == 1.0
@@ -0,0 +1,32 @@
+import time
+import metrics
+from engine_scheduler import EngineScheduler, engine_search
+from metrics import Reservoir, span
+
+def test_pacing_inside_a_query_is_not_query_latency():
+    metrics.durations.clear()
+    with span('query'):
+        with span('pacing'):
+            time.sleep(0.1)
+    assert metrics.durations['query'].maximum < 0.05
+    assert metrics.durations['pacing'].total >= 0.1
+
+def test_engine_slot_wait_is_recorded_as_pacing():
+    metrics.durations.clear()
+    search = engine_search(EngineScheduler(['duckduckgo'], rates={'duckduckgo': 5}),
+                           lambda client, query, engine: [])
+    for _ in range(3):
+        with span('query'):
+            search(None, 'q')
+    assert metrics.durations['query'].maximum < 0.1
+    assert metrics.durations['pacing'].total >= 0.3
+
+def test_reservoir_keeps_a_bounded_sample_and_exact_totals():
+    reservoir = Reservoir(size=100)
+    for i in range(10000):
+        reservoir.add(i / 10000)
+    assert len(reservoir.samples) == 100
+    assert reservoir.count == 10000 and reservoir.maximum == 0.9999
+    assert abs(reservoir.total - 4999.5) < 1e-6
+    p50, p95 = reservoir.quantiles((0.5, 0.95))
+    assert 0.3 < p50 < 0.7 and p95 > 0.8
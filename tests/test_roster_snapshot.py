@@ -0,0 +1,47 @@
+from datetime import datetime
+from names import NameIndex
+from roster_snapshot import RosterSnapshot
+
+RECENT = f"01/07/{datetime.now().year}"
+OLD = '01/07/2010'
+HEADER = "Nome,Data da Colação,Curso,Faculdade\n"
+
+def write_roster(path, *rows):
+    path.write_text(HEADER + ''.join(f"{','.join(row)}\n" for row in rows), encoding='utf-8')
+
+def changed_names(snapshot, path):
+    return [name for chunk in snapshot.changed_chunks(str(path)) for name in chunk['Nome']]
+
+def test_refresh_counts_the_whole_roster_and_reports_the_diff(tmp_path):
+    roster = tmp_path / 'roster.csv'
+    snapshot = RosterSnapshot(str(tmp_path / 'snapshot.db'))
+    write_roster(roster, ('Ana Costa', RECENT, 'Direito', 'USP'), ('Bruno Lima', RECENT, 'Direito', 'USP'),
+                 ('Bruno Lima', RECENT, 'Direito', 'USP'), ('Carla Dias', OLD, 'Direito', 'USP'))
+    assert snapshot.refresh(str(roster)) == (4, 3, 3, 0, 0)
+    # Old graduates come in settled, a repeated row once
+    assert changed_names(snapshot, roster) == ['Ana Costa', 'Bruno Lima']
+    # An unchanged file keeps its counts
+    assert snapshot.refresh(str(roster)) == (4, 3, 0, 0, 0)
+
+    write_roster(roster, ('Bruno Lima', RECENT, 'Medicina', 'USP'), ('Carla Dias', OLD, 'Direito', 'USP'),
+                 ('Davi Reis', RECENT, 'Direito', 'UNESP'))
+    assert snapshot.refresh(str(roster)) == (3, 2, 1, 1, 1)
+    assert changed_names(snapshot, roster) == ['Bruno Lima', 'Davi Reis']
+    snapshot.close()
+
+def test_settled_rows_are_not_changed_until_edited(tmp_path):
+    roster = tmp_path / 'roster.csv'
+    snapshot = RosterSnapshot(str(tmp_path / 'snapshot.db'))
+    ana = {'Nome': 'Ana Costa', 'Data da Colação': RECENT, 'Curso': 'Direito', 'Faculdade': 'USP'}
+    write_roster(roster, tuple(ana.values()), ('Bruno Lima', RECENT, 'Direito', 'USP'),
+                 ('Carla Dias', RECENT, 'Direito', 'USP'))
+    snapshot.refresh(str(roster))
+    snapshot.settle(str(roster), ana)
+    assert snapshot.settle_known(str(roster), NameIndex([('Bruno Lima', RECENT)])) == 1
+    assert changed_names(snapshot, roster) == ['Carla Dias']
+
+    write_roster(roster, ('Ana Costa', RECENT, 'Direito', 'UNESP'), ('Bruno Lima', RECENT, 'Direito', 'USP'),
+                 ('Carla Dias', RECENT, 'Direito', 'USP'))
+    snapshot.refresh(str(roster))
+    assert changed_names(snapshot, roster) == ['Carla Dias', 'Ana Costa']
+    snapshot.close()